@@ -2,6 +2,14 @@ use realfft::RealFftPlanner;
 use rustfft::num_complex::Complex;
 use std::sync::Arc;
 
+/// Kernels with at most this many taps are convolved directly in the time domain.
+///
+/// A direct pass costs `k_len` multiply-adds per sample and vectorizes cleanly,
+/// while the FFT path pays two real transforms (~`5·log2(fft_len)` flops per
+/// sample) plus the spectrum multiply. Below ~64 taps the direct loop wins for
+/// every practical trace length.
+pub(crate) const DIRECT_CONV_MAX_TAPS: usize = 64;
+
 /// Self-contained FFT convolution engine.
 ///
 /// Owns all FFT plans, scratch buffers, and the pre-computed kernel spectrum.
@@ -12,7 +20,7 @@ use std::sync::Arc;
 /// Buffers grow but never shrink to prevent WASM memory fragmentation.
 pub(crate) struct FftConvolver {
     planner: RealFftPlanner<f32>,
-    fft_len: usize, // padded FFT length (power of 2), 0 = uninitialized
+    fft_len: usize, // padded FFT length (2·3·5-smooth, even), 0 = uninitialized
 
     // Cached FFT plans (Arc from planner, avoids hash-map lookup per call)
     plan_fwd: Option<Arc<dyn realfft::RealToComplex<f32>>>,
@@ -22,6 +30,9 @@ pub(crate) struct FftConvolver {
     kernel_fft: Vec<Complex<f32>>,
     kernel_conj_fft: Vec<Complex<f32>>,
 
+    // Copy of a short kernel for time-domain convolution (empty = use FFT path)
+    direct_kernel: Vec<f32>,
+
     // Scratch buffers
     fft_input: Vec<f32>,
     fft_output: Vec<f32>,
@@ -30,6 +41,31 @@ pub(crate) struct FftConvolver {
     fft_scratch_inv: Vec<Complex<f32>>,
 }
 
+/// Smallest even 2·3·5-smooth length >= `n`.
+///
+/// Linear convolution only needs `fft_len >= signal_len + k_len - 1`; padding to
+/// the next power of two can nearly double the transform size, while rustfft has
+/// dedicated radix-3 and radix-5 butterflies that make smooth lengths just as fast
+/// per sample. Even lengths keep realfft on its half-length complex FFT path.
+pub(crate) fn next_fast_len(n: usize) -> usize {
+    if n <= 2 {
+        return 2;
+    }
+    let mut best = n.next_power_of_two();
+    let mut p5 = 1;
+    while p5 < best {
+        let mut p35 = p5;
+        while p35 < best {
+            // Smallest power-of-two multiple (>= 2, so the length stays even)
+            let p2 = n.div_ceil(p35).next_power_of_two().max(2);
+            best = best.min(p35 * p2);
+            p35 *= 3;
+        }
+        p5 *= 5;
+    }
+    best
+}
+
 impl FftConvolver {
     pub(crate) fn new() -> Self {
         FftConvolver {
@@ -39,6 +75,7 @@ impl FftConvolver {
             plan_inv: None,
             kernel_fft: Vec::new(),
             kernel_conj_fft: Vec::new(),
+            direct_kernel: Vec::new(),
             fft_input: Vec::new(),
             fft_output: Vec::new(),
             fft_spectrum: Vec::new(),
@@ -69,7 +106,7 @@ impl FftConvolver {
         }
 
         let min_len = signal_len + k_len - 1;
-        let padded_len = min_len.next_power_of_two();
+        let padded_len = next_fast_len(min_len);
 
         if padded_len == self.fft_len {
             return; // Already set up for this length
@@ -141,9 +178,14 @@ impl FftConvolver {
         for i in 0..spectrum_len {
             self.kernel_conj_fft[i] = self.kernel_fft[i].conj();
         }
+
+        self.direct_kernel.clear();
+        if k_len <= DIRECT_CONV_MAX_TAPS {
+            self.direct_kernel.extend_from_slice(kernel);
+        }
     }
 
-    /// FFT-based forward convolution: output[..signal_len] = (K * source)[..signal_len].
+    /// Forward convolution: output[..signal_len] = (K * source)[..signal_len].
     pub(crate) fn convolve_forward(
         &mut self,
         source: &[f32],
@@ -153,7 +195,7 @@ impl FftConvolver {
         self.convolve_impl(source, signal_len, output, false);
     }
 
-    /// FFT-based adjoint convolution (correlation): output[..signal_len] = (K^T * source)[..signal_len].
+    /// Adjoint convolution (correlation): output[..signal_len] = (K^T * source)[..signal_len].
     pub(crate) fn convolve_adjoint(
         &mut self,
         source: &[f32],
@@ -163,7 +205,7 @@ impl FftConvolver {
         self.convolve_impl(source, signal_len, output, true);
     }
 
-    /// Shared FFT convolution implementation.
+    /// Shared convolution implementation (direct for short kernels, FFT otherwise).
     /// `use_conjugate` selects `kernel_conj_fft` (adjoint) or `kernel_fft` (forward).
     fn convolve_impl(
         &mut self,
@@ -172,6 +214,16 @@ impl FftConvolver {
         output: &mut [f32],
         use_conjugate: bool,
     ) {
+        if !self.direct_kernel.is_empty() {
+            direct_convolve(
+                &self.direct_kernel,
+                &source[..signal_len],
+                &mut output[..signal_len],
+                use_conjugate,
+            );
+            return;
+        }
+
         let padded_len = self.fft_len;
         let spectrum_len = padded_len / 2 + 1;
 
@@ -216,6 +268,27 @@ impl FftConvolver {
     }
 }
 
+/// Time-domain counterpart of `convolve_impl` for short kernels.
+///
+/// Forward: `output[t] = sum_k kernel[k] * source[t - k]` (causal, truncated).
+/// Adjoint: `output[t] = sum_k kernel[k] * source[t + k]` (exact transpose).
+/// Loops run tap-major so each inner pass is a contiguous axpy that vectorizes.
+fn direct_convolve(kernel: &[f32], source: &[f32], output: &mut [f32], adjoint: bool) {
+    let n = source.len();
+    output.fill(0.0);
+    for (k, &h) in kernel.iter().enumerate().take(n) {
+        if adjoint {
+            for (o, &x) in output[..n - k].iter_mut().zip(&source[k..]) {
+                *o += h * x;
+            }
+        } else {
+            for (o, &x) in output[k..].iter_mut().zip(&source[..n - k]) {
+                *o += h * x;
+            }
+        }
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -250,6 +323,65 @@ mod tests {
         }
     }
 
+    /// next_fast_len: even, 2·3·5-smooth, >= n, and the smallest such length.
+    #[test]
+    fn next_fast_len_is_smallest_smooth_even() {
+        fn is_smooth_even(mut m: usize) -> bool {
+            if m % 2 != 0 {
+                return false;
+            }
+            for p in [2, 3, 5] {
+                while m % p == 0 {
+                    m /= p;
+                }
+            }
+            m == 1
+        }
+        for n in 0..2000 {
+            let len = next_fast_len(n);
+            assert!(
+                len >= n && is_smooth_even(len),
+                "bad length {} for n={}",
+                len,
+                n
+            );
+            let expected = (n.max(2)..).find(|&m| is_smooth_even(m)).unwrap();
+            assert_eq!(len, expected, "n={}", n);
+        }
+        // Never worse than the previous power-of-two padding
+        assert_eq!(next_fast_len(1025), 1080);
+        assert!(next_fast_len(40_001) < 40_001_usize.next_power_of_two());
+    }
+
+    /// Non-power-of-two FFT lengths still produce the causal linear convolution.
+    #[test]
+    fn smooth_length_matches_time_domain() {
+        let kernel = build_kernel(0.02, 0.4, 30.0);
+        let n = 300; // 300 + 166 - 1 = 465 -> 480 (not a power of two)
+
+        let mut conv = FftConvolver::new();
+        conv.ensure_buffers(n, &kernel);
+        assert!(!conv.fft_len().is_power_of_two());
+
+        let x: Vec<f32> = (0..n).map(|i| ((i * 7) % 13) as f32 * 0.1).collect();
+        let mut out = vec![0.0_f32; n];
+        conv.convolve_forward(&x, n, &mut out);
+
+        for t in 0..n {
+            let mut expected = 0.0_f32;
+            for k in 0..kernel.len().min(t + 1) {
+                expected += kernel[k] * x[t - k];
+            }
+            assert!(
+                (out[t] - expected).abs() < 1e-3,
+                "mismatch at {}: fft={} td={}",
+                t,
+                out[t],
+                expected
+            );
+        }
+    }
+
     /// Adjoint identity: <Kx, y> == <x, K^T y> for deterministic vectors.
     #[test]
     fn adjoint_identity() {
@@ -293,4 +425,45 @@ mod tests {
             rel_err
         );
     }
+
+    /// Short kernels take the direct time-domain path and match the FFT path
+    /// in both the forward and adjoint directions.
+    #[test]
+    fn direct_path_matches_fft_path() {
+        let kernel = build_kernel(0.02, 0.1, 30.0);
+        assert!(kernel.len() <= DIRECT_CONV_MAX_TAPS);
+        let n = 257;
+
+        let mut direct = FftConvolver::new();
+        direct.ensure_buffers(n, &kernel);
+        assert!(!direct.direct_kernel.is_empty());
+
+        let mut fft = FftConvolver::new();
+        fft.ensure_buffers(n, &kernel);
+        fft.direct_kernel.clear();
+
+        let x: Vec<f32> = (0..n).map(|i| ((i * 11) % 17) as f32 * 0.1 - 0.5).collect();
+        for adjoint in [false, true] {
+            let mut out_direct = vec![0.0_f32; n];
+            let mut out_fft = vec![0.0_f32; n];
+            direct.convolve_impl(&x, n, &mut out_direct, adjoint);
+            fft.convolve_impl(&x, n, &mut out_fft, adjoint);
+            for t in 0..n {
+                assert!(
+                    (out_direct[t] - out_fft[t]).abs() < 1e-4,
+                    "adjoint={} mismatch at {}: direct={} fft={}",
+                    adjoint,
+                    t,
+                    out_direct[t],
+                    out_fft[t]
+                );
+            }
+        }
+
+        // Long kernels keep using the FFT path
+        let long_kernel = build_kernel(0.02, 0.4, 30.0);
+        let mut conv = FftConvolver::new();
+        conv.ensure_buffers(n, &long_kernel);
+        assert!(conv.direct_kernel.is_empty());
+    }
 }
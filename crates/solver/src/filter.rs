@@ -62,8 +62,8 @@ impl BandpassFilter {
 
     /// Convenience: set both HP and LP together (used by CaTune's single toggle).
     pub fn set_enabled(&mut self, enabled: bool) {
-        self.hp_enabled = enabled;
-        self.lp_enabled = enabled;
+        self.set_hp_enabled(enabled);
+        self.set_lp_enabled(enabled);
     }
 
     /// Returns true if either HP or LP is active.
@@ -72,11 +72,19 @@ impl BandpassFilter {
     }
 
     pub fn set_hp_enabled(&mut self, enabled: bool) {
-        self.hp_enabled = enabled;
+        if enabled != self.hp_enabled {
+            self.hp_enabled = enabled;
+            // The cached gain curve depends on which bands are active.
+            self.planned_len = 0;
+        }
     }
 
     pub fn set_lp_enabled(&mut self, enabled: bool) {
-        self.lp_enabled = enabled;
+        if enabled != self.lp_enabled {
+            self.lp_enabled = enabled;
+            // The cached gain curve depends on which bands are active.
+            self.planned_len = 0;
+        }
     }
 
     pub fn is_hp_enabled(&self) -> bool {
@@ -161,6 +169,9 @@ impl BandpassFilter {
     /// - HP+LP: full bandpass (HP taper → passband → LP taper)
     /// - HP-only: HP taper → passband to Nyquist (gain=1.0 above HP)
     /// - LP-only: passband from DC → LP taper → stopband (gain=1.0 below LP)
+    ///
+    /// Region edges are located once per cutoff, so stop/passbands are plain
+    /// slice fills and `cos` is evaluated only inside the taper bins.
     fn build_gain_curve(&mut self, n: usize) {
         let spectrum_len = n / 2 + 1;
         let df = self.fs / n as f32;
@@ -168,37 +179,27 @@ impl BandpassFilter {
         let w_hp = self.f_hp * 0.5;
         let w_lp = self.f_lp * 0.5;
 
-        let hp_on = self.hp_enabled;
-        let lp_on = self.lp_enabled;
-
-        for i in 0..spectrum_len {
-            let f = i as f32 * df;
-
-            // High-pass contribution (1.0 when disabled)
-            let hp_gain = if !hp_on {
-                1.0
-            } else if f < self.f_hp - w_hp {
-                0.0
-            } else if f < self.f_hp + w_hp {
-                let t = (f - (self.f_hp - w_hp)) / (2.0 * w_hp);
-                0.5 * (1.0 - (PI * t).cos())
-            } else {
-                1.0
-            };
-
-            // Low-pass contribution (1.0 when disabled)
-            let lp_gain = if !lp_on {
-                1.0
-            } else if f < self.f_lp - w_lp {
-                1.0
-            } else if f < self.f_lp + w_lp {
-                let t = (f - (self.f_lp - w_lp)) / (2.0 * w_lp);
-                0.5 * (1.0 + (PI * t).cos())
-            } else {
-                0.0
-            };
-
-            self.gain_curve[i] = hp_gain * lp_gain;
+        let gain = &mut self.gain_curve[..spectrum_len];
+        gain.fill(1.0);
+
+        if self.hp_enabled {
+            let lo = first_bin_at_or_above(self.f_hp - w_hp, df, spectrum_len);
+            let hi = first_bin_at_or_above(self.f_hp + w_hp, df, spectrum_len);
+            gain[..lo].fill(0.0);
+            for (i, g) in gain.iter_mut().enumerate().take(hi).skip(lo) {
+                let t = (i as f32 * df - (self.f_hp - w_hp)) / (2.0 * w_hp);
+                *g = 0.5 * (1.0 - (PI * t).cos());
+            }
+        }
+
+        if self.lp_enabled {
+            let lo = first_bin_at_or_above(self.f_lp - w_lp, df, spectrum_len);
+            let hi = first_bin_at_or_above(self.f_lp + w_lp, df, spectrum_len);
+            for (i, g) in gain.iter_mut().enumerate().take(hi).skip(lo) {
+                let t = (i as f32 * df - (self.f_lp - w_lp)) / (2.0 * w_lp);
+                *g *= 0.5 * (1.0 + (PI * t).cos());
+            }
+            gain[hi..].fill(0.0);
         }
     }
 
@@ -301,6 +302,23 @@ impl BandpassFilter {
     }
 }
 
+/// Index of the first spectrum bin whose frequency `i * df` is `>= threshold`.
+///
+/// Bin frequencies are monotone in `i`, so a binary search over the same
+/// `f < threshold` comparison the per-bin loop used yields identical band edges.
+fn first_bin_at_or_above(threshold: f32, df: f32, spectrum_len: usize) -> usize {
+    let (mut lo, mut hi) = (0, spectrum_len);
+    while lo < hi {
+        let mid = lo + (hi - lo) / 2;
+        if (mid as f32 * df) < threshold {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    lo
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -575,4 +593,77 @@ mod tests {
             filtered_power / original_power
         );
     }
+
+    /// Region-based gain curve is bit-identical to the per-bin branchy reference.
+    #[test]
+    fn test_gain_curve_matches_per_bin_reference() {
+        fn reference(f: &BandpassFilter, n: usize) -> Vec<f32> {
+            let df = f.fs / n as f32;
+            let (w_hp, w_lp) = (f.f_hp * 0.5, f.f_lp * 0.5);
+            (0..n / 2 + 1)
+                .map(|i| {
+                    let x = i as f32 * df;
+                    let hp = if !f.hp_enabled || x >= f.f_hp + w_hp {
+                        1.0
+                    } else if x < f.f_hp - w_hp {
+                        0.0
+                    } else {
+                        0.5 * (1.0 - (PI * ((x - (f.f_hp - w_hp)) / (2.0 * w_hp))).cos())
+                    };
+                    let lp = if !f.lp_enabled || x < f.f_lp - w_lp {
+                        1.0
+                    } else if x >= f.f_lp + w_lp {
+                        0.0
+                    } else {
+                        0.5 * (1.0 + (PI * ((x - (f.f_lp - w_lp)) / (2.0 * w_lp))).cos())
+                    };
+                    hp * lp
+                })
+                .collect()
+        }
+
+        for (tau_rise, tau_decay, fs) in [(0.02, 0.4, 30.0), (0.1, 0.4, 100.0), (0.05, 1.2, 20.0)] {
+            for (hp, lp) in [(true, true), (true, false), (false, true)] {
+                for n in [8, 9, 257, 1000, 4096] {
+                    let mut f = make_filter(tau_rise, tau_decay, fs);
+                    f.set_hp_enabled(hp);
+                    f.set_lp_enabled(lp);
+                    f.ensure_buffers(n);
+                    let expected = reference(&f, n);
+                    assert_eq!(
+                        &f.gain_curve[..n / 2 + 1],
+                        &expected[..],
+                        "tau=({}, {}) fs={} hp={} lp={} n={}",
+                        tau_rise,
+                        tau_decay,
+                        fs,
+                        hp,
+                        lp,
+                        n
+                    );
+                }
+            }
+        }
+    }
+
+    #[test]
+    fn test_toggle_rebuilds_gain_curve() {
+        let trace: Vec<f32> = (0..256)
+            .map(|i| 1.0 + (2.0 * PI * 0.5 * i as f32 / 30.0).sin())
+            .collect();
+
+        let mut toggled = make_filter(0.02, 0.4, 30.0);
+        let mut warm = trace.clone();
+        assert!(toggled.apply(&mut warm));
+        toggled.set_hp_enabled(false);
+        let mut got = trace.clone();
+        assert!(toggled.apply(&mut got));
+
+        let mut fresh = make_filter(0.02, 0.4, 30.0);
+        fresh.set_hp_enabled(false);
+        let mut expected = trace.clone();
+        assert!(fresh.apply(&mut expected));
+
+        assert_eq!(got, expected);
+    }
 }
@@ -18,7 +18,10 @@ impl Solver {
     /// criterion detects momentum is hurting progress, reset to avoid oscillation.
     ///
     /// Uses FFT-based O(n log n) convolutions instead of time-domain O(n*k), and
-    /// primal residual convergence criterion to eliminate one convolution per iteration.
+    /// primal residual convergence criterion to eliminate one convolution per iteration:
+    /// each iteration runs exactly two convolutions (forward at y_k, adjoint of the
+    /// residual) and never evaluates the objective. The reconvolution at the final
+    /// x_k is computed lazily, once, when a caller asks for it.
     pub fn step_batch(&mut self, n_steps: u32) -> bool {
         let n = self.active_len;
         if n == 0 {
@@ -55,8 +58,7 @@ impl Solver {
             //     mathematically cancels in the gradient (residual = mean-centered signals).
             //     Computing it anyway would produce pure momentum-oscillation noise.
             if !self.filtered {
-                let raw =
-                    crate::compute_raw_baseline(&self.trace[..n], &self.reconvolution[..n], n);
+                let raw = crate::compute_raw_baseline(self.trace_sum, &self.reconvolution[..n]);
                 self.update_baseline_ema(raw);
             }
 
@@ -77,35 +79,18 @@ impl Solver {
                     .convolve_adjoint(&self.residual_buf[..n], &mut self.gradient[..n]),
             }
 
-            // 4. Loop A (fused): save x_k + proximal gradient step
+            self.iteration += 1;
+
+            // 4-6. Single fused pass: proximal step, convergence/restart accumulators,
+            //    and momentum extrapolation.
             //    x_{k+1} = prox(y_k - step_size * gradient)
-            //    Constraint match hoisted outside inner loop for SIMD auto-vectorization.
+            //    y_{k+1} = prox(x_{k+1} + momentum * (x_{k+1} - x_k))
+            // y_k and x_k are read before their slots are overwritten, so each element
+            // is touched once per iteration. Momentum is computed tentatively up front
+            // (it only depends on t_fista); on restart (rare) it is undone below with a
+            // single copy_from_slice.
             let step_f32 = step_size as f32;
             let thresh_f32 = threshold as f32;
-            match self.constraint {
-                Constraint::NonNegative => {
-                    for i in 0..n {
-                        let x_old = self.solution[i];
-                        self.residual_buf[i] = x_old;
-                        let z = self.solution_prev[i] - step_f32 * self.gradient[i];
-                        self.solution[i] = (z - thresh_f32).max(0.0);
-                    }
-                }
-                Constraint::Box01 => {
-                    for i in 0..n {
-                        let x_old = self.solution[i];
-                        self.residual_buf[i] = x_old;
-                        let z = self.solution_prev[i] - step_f32 * self.gradient[i];
-                        self.solution[i] = (z - thresh_f32).clamp(0.0, 1.0);
-                    }
-                }
-            }
-
-            self.iteration += 1;
-
-            // 5+6. Fused Loop B+C: convergence/restart accumulators + momentum extrapolation.
-            // Compute tentative momentum BEFORE the loop (only depends on self.t_fista).
-            // On restart (rare), correct with a single copy_from_slice afterwards.
             let t_new = (1.0 + (1.0 + 4.0 * self.t_fista * self.t_fista).sqrt()) / 2.0;
             let momentum = ((self.t_fista - 1.0) / t_new) as f32;
             let check_restart = self.iteration > 1;
@@ -120,27 +105,31 @@ impl Solver {
             match self.constraint {
                 Constraint::NonNegative => {
                     for i in 0..n {
-                        let x_new = self.solution[i];
-                        let x_old = self.residual_buf[i];
+                        let y = self.solution_prev[i];
+                        let x_old = self.solution[i];
+                        let x_new = (y - step_f32 * self.gradient[i] - thresh_f32).max(0.0);
                         let x_new_f64 = x_new as f64;
                         let x_old_f64 = x_old as f64;
                         let d = x_new_f64 - x_old_f64;
                         diff_sq += d * d;
                         xk_sq += x_old_f64 * x_old_f64;
-                        dot += (self.solution_prev[i] as f64 - x_new_f64) * d;
+                        dot += (y as f64 - x_new_f64) * d;
+                        self.solution[i] = x_new;
                         self.solution_prev[i] = (x_new + momentum * (x_new - x_old)).max(0.0);
                     }
                 }
                 Constraint::Box01 => {
                     for i in 0..n {
-                        let x_new = self.solution[i];
-                        let x_old = self.residual_buf[i];
+                        let y = self.solution_prev[i];
+                        let x_old = self.solution[i];
+                        let x_new = (y - step_f32 * self.gradient[i] - thresh_f32).clamp(0.0, 1.0);
                         let x_new_f64 = x_new as f64;
                         let x_old_f64 = x_old as f64;
                         let d = x_new_f64 - x_old_f64;
                         diff_sq += d * d;
                         xk_sq += x_old_f64 * x_old_f64;
-                        dot += (self.solution_prev[i] as f64 - x_new_f64) * d;
+                        dot += (y as f64 - x_new_f64) * d;
+                        self.solution[i] = x_new;
                         self.solution_prev[i] =
                             (x_new + momentum * (x_new - x_old)).clamp(0.0, 1.0);
                     }
@@ -414,7 +403,6 @@ mod tests {
         let active = warm_solver.active_len;
         warm_solver.solution_prev[..active].copy_from_slice(&warm_solver.solution[..active]);
         warm_solver.converged = false;
-        warm_solver.prev_objective = f64::INFINITY;
         warm_solver.iteration = 0;
         warm_solver.t_fista = 1.0;
 
@@ -666,4 +654,84 @@ mod tests {
             );
         }
     }
+
+    // Test 14: Lambda-only set_params keeps kernel state and matches a fresh solver
+    #[test]
+    fn lambda_only_set_params_matches_fresh_solver() {
+        let kernel = build_kernel(0.02, 0.4, 30.0);
+        let trace = build_trace(&kernel, 200, &[10, 50, 100, 150]);
+
+        let mut reused = Solver::new();
+        reused.set_params(0.02, 0.4, 0.01, 30.0);
+        solve_to_convergence(&mut reused, &trace, 200, 10);
+        let lipschitz = reused.lipschitz_constant;
+        reused.set_params(0.02, 0.4, 0.05, 30.0);
+        assert_eq!(reused.lipschitz_constant, lipschitz);
+        solve_to_convergence(&mut reused, &trace, 200, 10);
+
+        let mut fresh = Solver::new();
+        fresh.set_params(0.02, 0.4, 0.05, 30.0);
+        solve_to_convergence(&mut fresh, &trace, 200, 10);
+
+        assert_eq!(reused.iteration_count(), fresh.iteration_count());
+        assert_eq!(reused.get_solution(), fresh.get_solution());
+    }
+
+    // Test 15: Cached trace sum tracks every trace mutation
+    #[test]
+    fn trace_sum_tracks_trace_mutations() {
+        fn direct_sum(solver: &Solver) -> f64 {
+            solver.trace[..solver.active_len]
+                .iter()
+                .map(|&v| v as f64)
+                .sum()
+        }
+
+        let kernel = build_kernel(0.02, 0.4, 30.0);
+        let mut trace = build_trace(&kernel, 300, &[20, 120, 220]);
+        for (i, v) in trace.iter_mut().enumerate() {
+            *v += 2.0 + 0.01 * i as f32;
+        }
+
+        let mut solver = Solver::new();
+        solver.set_params(0.02, 0.4, 0.01, 30.0);
+        solver.set_trace(&trace);
+        assert_eq!(solver.trace_sum, direct_sum(&solver));
+
+        solver.set_filter_enabled(true);
+        assert!(solver.apply_filter());
+        assert_eq!(solver.trace_sum, direct_sum(&solver));
+
+        solver.subtract_baseline();
+        assert_eq!(solver.trace_sum, direct_sum(&solver));
+
+        solver.set_trace(&trace[..150]);
+        assert_eq!(solver.trace_sum, direct_sum(&solver));
+    }
+
+    // Test 16: Kernel change made in banded mode reaches the FFT engine
+    #[test]
+    fn banded_set_params_then_fft_matches_fresh_solver() {
+        use crate::ConvMode;
+
+        // Same tau_decay and fs keep the kernel (and padded FFT) length fixed,
+        // so only a stale kernel spectrum could make the solves differ.
+        let kernel = build_kernel(0.05, 0.4, 30.0);
+        let trace = build_trace(&kernel, 200, &[10, 50, 100, 150]);
+
+        let mut reused = Solver::new();
+        reused.set_params(0.02, 0.4, 0.01, 30.0);
+        solve_to_convergence(&mut reused, &trace, 200, 10);
+        reused.set_conv_mode(ConvMode::BandedAR2);
+        reused.set_params(0.05, 0.4, 0.01, 30.0);
+        reused.set_conv_mode(ConvMode::Fft);
+        solve_to_convergence(&mut reused, &trace, 200, 10);
+
+        let mut fresh = Solver::new();
+        fresh.set_params(0.05, 0.4, 0.01, 30.0);
+        solve_to_convergence(&mut fresh, &trace, 200, 10);
+
+        assert_eq!(reused.iteration_count(), fresh.iteration_count());
+        assert_eq!(reused.get_solution(), fresh.get_solution());
+    }
 }
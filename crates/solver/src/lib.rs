@@ -85,12 +85,12 @@ pub struct Solver {
     pub(crate) active_len: usize,
 
     // Convergence tracking
-    pub(crate) prev_objective: f64,
     pub(crate) tolerance: f64,
     pub(crate) lipschitz_constant: f64,
 
     // Baseline and kernel scaling
     pub(crate) baseline: f64,
+    pub(crate) trace_sum: f64, // sum of trace[..active_len], refreshed whenever the trace changes
     baseline_ema: f64,
     baseline_ema_init: bool,
     kernel_dc_gain: f64,
@@ -132,10 +132,10 @@ impl Solver {
             t_fista: 1.0,
             converged: false,
             active_len: 0,
-            prev_objective: f64::INFINITY,
             tolerance: 1e-4,
             lipschitz_constant: 1.0,
             baseline: 0.0,
+            trace_sum: 0.0,
             baseline_ema: 0.0,
             baseline_ema_init: false,
             kernel_dc_gain: 1.0,
@@ -152,15 +152,26 @@ impl Solver {
         solver.kernel = build_kernel(solver.tau_rise, solver.tau_decay, solver.fs);
         solver.lipschitz_constant = compute_lipschitz(&solver.kernel);
         solver.kernel_dc_gain = solver.kernel.iter().map(|&k| k as f64).sum();
+        solver
+            .bandpass
+            .update_cutoffs(solver.tau_rise, solver.tau_decay, solver.fs);
 
         solver
     }
 
     /// Update solver parameters and rebuild kernel.
+    ///
+    /// Kernel-derived state (kernel, DC gain, Lipschitz constant, kernel spectrum,
+    /// bandpass cutoffs) depends only on tau/fs, so lambda-only updates — e.g.
+    /// sparsity slider drags — reuse it instead of rebuilding.
     pub fn set_params(&mut self, tau_rise: f64, tau_decay: f64, lambda: f64, fs: f64) {
+        self.lambda = lambda;
+        if tau_rise == self.tau_rise && tau_decay == self.tau_decay && fs == self.fs {
+            return;
+        }
+
         self.tau_rise = tau_rise;
         self.tau_decay = tau_decay;
-        self.lambda = lambda;
         self.fs = fs;
         self.kernel = build_kernel(tau_rise, tau_decay, fs);
         self.kernel_dc_gain = self.kernel.iter().map(|&k| k as f64).sum();
@@ -170,6 +181,10 @@ impl Solver {
         match self.conv_mode {
             ConvMode::BandedAR2 => {
                 self.banded.update(tau_rise, tau_decay, fs);
+                // The cached kernel spectrum now belongs to the old kernel, and
+                // ensure_buffers keeps it when the padded length is unchanged.
+                // Force a rebuild the next time FFT mode prepares its buffers.
+                self.fft.invalidate();
             }
             ConvMode::Fft => {
                 // banded will be updated lazily if conv_mode switches
@@ -209,6 +224,7 @@ impl Solver {
         // Copy trace data and zero out solution buffers for active region
         let n = trace.len();
         self.trace[..n].copy_from_slice(trace);
+        self.refresh_trace_sum();
         self.solution[..n].fill(0.0);
         self.solution_prev[..n].fill(0.0);
         self.gradient[..n].fill(0.0);
@@ -219,7 +235,6 @@ impl Solver {
         self.iteration = 0;
         self.t_fista = 1.0;
         self.converged = false;
-        self.prev_objective = f64::INFINITY;
         self.baseline = 0.0;
         self.baseline_ema = 0.0;
         self.baseline_ema_init = false;
@@ -404,12 +419,21 @@ impl Solver {
         // Recompute baseline at current solution for display alignment.
         // In step_batch, baseline is skipped when filtered (cancels in gradient),
         // but the display path always needs it to align fit with trace.
-        let raw = compute_raw_baseline(&self.trace[..n], &self.reconvolution[..n], n);
+        let raw = compute_raw_baseline(self.trace_sum, &self.reconvolution[..n]);
         self.update_baseline_ema(raw);
 
         self.reconvolution_stale = false;
     }
 
+    /// Recompute the cached trace sum used by baseline estimation.
+    /// Must be called after every mutation of the active trace region.
+    fn refresh_trace_sum(&mut self) {
+        self.trace_sum = self.trace[..self.active_len]
+            .iter()
+            .map(|&v| v as f64)
+            .sum();
+    }
+
     /// Update the baseline EMA from a raw baseline estimate.
     /// Called by both `step_batch` (per-iteration) and `compute_reconvolution` (lazy display path).
     fn update_baseline_ema(&mut self, raw_baseline: f64) {
@@ -449,6 +473,9 @@ impl Solver {
     pub fn apply_filter(&mut self) -> bool {
         let n = self.active_len;
         let applied = self.bandpass.apply(&mut self.trace[..n]);
+        if applied {
+            self.refresh_trace_sum();
+        }
         if applied && self.bandpass.is_hp_enabled() {
             self.filtered = true;
         }
@@ -468,6 +495,7 @@ impl Solver {
         }
         let window = baseline::baseline_window(self.tau_decay, self.fs);
         baseline::subtract_rolling_baseline(&mut self.trace[..n], window, 0.2);
+        self.refresh_trace_sum();
         self.filtered = true;
     }
 
@@ -521,7 +549,6 @@ impl Solver {
         self.iteration = read_u32_le(&mut cur);
         self.baseline = read_f64_le(&mut cur);
         self.converged = false;
-        self.prev_objective = f64::INFINITY;
 
         for i in 0..saved_len {
             self.solution[i] = read_f32_le(&mut cur);
@@ -533,12 +560,13 @@ impl Solver {
 }
 
 /// Compute the mean residual (trace - reconvolution) as the raw baseline estimate.
-pub(crate) fn compute_raw_baseline(trace: &[f32], reconvolution: &[f32], n: usize) -> f64 {
-    let mut sum = 0.0_f64;
-    for i in 0..n {
-        sum += (trace[i] - reconvolution[i]) as f64;
-    }
-    sum / n as f64
+///
+/// `mean(trace - reconvolution) = (sum(trace) - sum(reconvolution)) / n`, and the
+/// trace sum is constant across iterations, so callers pass the cached
+/// `Solver::trace_sum` and only the reconvolution is streamed per call.
+pub(crate) fn compute_raw_baseline(trace_sum: f64, reconvolution: &[f32]) -> f64 {
+    let recon_sum: f64 = reconvolution.iter().map(|&v| v as f64).sum();
+    (trace_sum - recon_sum) / reconvolution.len() as f64
 }
 
 /// Byte length of serialized solver state for a trace of length `n`.
@@ -1,4 +1,6 @@
-use numpy::{PyArray1, PyReadonlyArray1, PyReadonlyArray2, PyUntypedArrayMethods};
+use numpy::{
+    PyArray1, PyArray2, PyArrayMethods, PyReadonlyArray1, PyReadonlyArray2, PyUntypedArrayMethods,
+};
 use pyo3::prelude::*;
 
 use crate::kernel::{build_kernel, compute_lipschitz};
@@ -84,14 +86,20 @@ impl PySolver {
     }
 
     /// Run n FISTA iterations. Returns true if converged.
-    fn step_batch(&mut self, n_steps: u32) -> bool {
-        self.inner.step_batch(n_steps)
+    /// Releases the GIL while iterating.
+    fn step_batch(&mut self, py: Python<'_>, n_steps: u32) -> bool {
+        let inner = &mut self.inner;
+        py.allow_threads(|| inner.step_batch(n_steps))
     }
 
     /// Run solver to convergence (up to max_iters). Returns iterations run.
-    fn solve(&mut self, max_iters: u32) -> u32 {
-        run_to_convergence(&mut self.inner, max_iters);
-        self.inner.iteration_count()
+    /// Releases the GIL while solving.
+    fn solve(&mut self, py: Python<'_>, max_iters: u32) -> u32 {
+        let inner = &mut self.inner;
+        py.allow_threads(|| {
+            run_to_convergence(inner, max_iters);
+            inner.iteration_count()
+        })
     }
 
     /// Get the deconvolved activity (non-negative spike train).
@@ -137,14 +145,17 @@ impl PySolver {
         self.inner.iteration_count()
     }
 
-    /// Apply bandpass filter to loaded trace.
-    fn apply_filter(&mut self) -> bool {
-        self.inner.apply_filter()
+    /// Apply bandpass filter to loaded trace. Releases the GIL while filtering.
+    fn apply_filter(&mut self, py: Python<'_>) -> bool {
+        let inner = &mut self.inner;
+        py.allow_threads(|| inner.apply_filter())
     }
 
     /// Subtract rolling-percentile baseline from loaded trace.
-    fn subtract_baseline(&mut self) {
-        self.inner.subtract_baseline();
+    /// Releases the GIL while computing the baseline.
+    fn subtract_baseline(&mut self, py: Python<'_>) {
+        let inner = &mut self.inner;
+        py.allow_threads(|| inner.subtract_baseline());
     }
 
     /// Convenience: set both HP and LP filter together.
@@ -240,17 +251,20 @@ fn deconvolve_single<'py>(
     configure_solver_options(&mut solver, conv_mode, constraint)?;
 
     let trace_f32 = to_f32_vec(&trace)?;
-    solver.set_trace(&trace_f32);
 
-    if hp_enabled || lp_enabled {
-        solver.set_hp_filter_enabled(hp_enabled);
-        solver.set_lp_filter_enabled(lp_enabled);
-        solver.apply_filter();
-    }
+    py.allow_threads(|| {
+        solver.set_trace(&trace_f32);
+
+        if hp_enabled || lp_enabled {
+            solver.set_hp_filter_enabled(hp_enabled);
+            solver.set_lp_filter_enabled(lp_enabled);
+            solver.apply_filter();
+        }
 
-    solver.subtract_baseline();
+        solver.subtract_baseline();
 
-    run_to_convergence(&mut solver, max_iters);
+        run_to_convergence(&mut solver, max_iters);
+    });
 
     Ok((
         PyArray1::from_vec(py, solver.get_solution()),
@@ -262,7 +276,14 @@ fn deconvolve_single<'py>(
 }
 
 /// Batch deconvolution for a 2D array of traces (n_cells x n_timepoints).
-/// Returns (activities, baselines, reconvolutions, iterations, convergeds).
+/// Returns (activities, baselines, reconvolutions, iterations, convergeds), where
+/// activities and reconvolutions are C-contiguous (n_cells x n_timepoints) arrays
+/// and baselines (f64), iterations (u32) and convergeds (bool) are length-n_cells
+/// arrays, so no per-cell Python objects are created.
+///
+/// All rows share one Solver, so the kernel spectrum and FFT plans are computed
+/// once; results are written into flat row-major buffers and handed to numpy
+/// without per-row array objects.
 #[pyfunction]
 #[pyo3(signature = (traces, fs, tau_rise, tau_decay, lambda_, hp_enabled=false, lp_enabled=false, max_iters=2000, conv_mode="fft", constraint="nonneg"))]
 fn deconvolve_batch<'py>(
@@ -278,14 +299,15 @@ fn deconvolve_batch<'py>(
     conv_mode: &str,
     constraint: &str,
 ) -> PyResult<(
-    Vec<Bound<'py, PyArray1<f32>>>,
-    Vec<f64>,
-    Vec<Bound<'py, PyArray1<f32>>>,
-    Vec<u32>,
-    Vec<bool>,
+    Bound<'py, PyArray2<f32>>,
+    Bound<'py, PyArray1<f64>>,
+    Bound<'py, PyArray2<f32>>,
+    Bound<'py, PyArray1<u32>>,
+    Bound<'py, PyArray1<bool>>,
 )> {
     let shape = traces.shape();
     let n_cells = shape[0];
+    let n_timepoints = shape[1];
 
     let mut solver = Solver::new();
     solver.set_params(tau_rise, tau_decay, lambda_, fs);
@@ -296,45 +318,61 @@ fn deconvolve_batch<'py>(
         solver.set_lp_filter_enabled(lp_enabled);
     }
 
-    let mut activities = Vec::with_capacity(n_cells);
-    let mut baselines = Vec::with_capacity(n_cells);
-    let mut reconvolutions = Vec::with_capacity(n_cells);
-    let mut iterations = Vec::with_capacity(n_cells);
-    let mut convergeds = Vec::with_capacity(n_cells);
-
-    let traces_ref = traces.as_array();
-    let n_timepoints = shape[1];
-    let mut trace_f32: Vec<f32> = Vec::with_capacity(n_timepoints);
-
-    for cell_idx in 0..n_cells {
-        trace_f32.clear();
-        trace_f32.extend(traces_ref.row(cell_idx).iter().map(|&v| v as f32));
-        solver.set_trace(&trace_f32);
-
-        if hp_enabled || lp_enabled {
-            solver.apply_filter();
-        }
-
-        solver.subtract_baseline();
-
-        run_to_convergence(&mut solver, max_iters);
-
-        activities.push(PyArray1::from_vec(py, solver.get_solution()));
-        baselines.push(solver.get_baseline());
-        reconvolutions.push(PyArray1::from_vec(
-            py,
-            solver.get_reconvolution_with_baseline(),
-        ));
-        iterations.push(solver.iteration_count());
-        convergeds.push(solver.converged());
-    }
+    // A borrowed view is Send, so the solve loop can read the numpy buffer
+    // directly with the GIL released; rows are converted to f32 one at a
+    // time into a single reusable buffer instead of copying the whole matrix.
+    let traces_view = traces.as_array();
+
+    let (activities, baselines, reconvolutions, iterations, convergeds) =
+        py.allow_threads(move || {
+            let mut row_f32: Vec<f32> = vec![0.0; n_timepoints];
+            let mut activities: Vec<f32> = Vec::with_capacity(n_cells * n_timepoints);
+            let mut reconvolutions: Vec<f32> = Vec::with_capacity(n_cells * n_timepoints);
+            let mut baselines = Vec::with_capacity(n_cells);
+            let mut iterations = Vec::with_capacity(n_cells);
+            let mut convergeds = Vec::with_capacity(n_cells);
+
+            for row in traces_view.rows() {
+                for (dst, &src) in row_f32.iter_mut().zip(row.iter()) {
+                    *dst = src as f32;
+                }
+                solver.set_trace(&row_f32);
+
+                if hp_enabled || lp_enabled {
+                    solver.apply_filter();
+                }
+
+                solver.subtract_baseline();
+
+                run_to_convergence(&mut solver, max_iters);
+
+                // Copy straight from the solver's buffers into the batch outputs
+                // (the public getters each allocate a per-cell Vec).
+                // get_baseline() also refreshes a stale reconvolution.
+                let baseline = solver.get_baseline();
+                activities.extend_from_slice(&solver.solution[..n_timepoints]);
+                let b = baseline as f32;
+                reconvolutions.extend(solver.reconvolution[..n_timepoints].iter().map(|&v| v + b));
+                baselines.push(baseline);
+                iterations.push(solver.iteration_count());
+                convergeds.push(solver.converged());
+            }
+
+            (
+                activities,
+                baselines,
+                reconvolutions,
+                iterations,
+                convergeds,
+            )
+        });
 
     Ok((
-        activities,
-        baselines,
-        reconvolutions,
-        iterations,
-        convergeds,
+        PyArray1::from_vec(py, activities).reshape([n_cells, n_timepoints])?,
+        PyArray1::from_vec(py, baselines),
+        PyArray1::from_vec(py, reconvolutions).reshape([n_cells, n_timepoints])?,
+        PyArray1::from_vec(py, iterations),
+        PyArray1::from_vec(py, convergeds),
     ))
 }
 
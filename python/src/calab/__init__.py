@@ -17,7 +17,13 @@ from ._compute import (
     solve_trace,
     tau_to_ar2,
 )
-from ._io import deconvolve_from_export, load_export_params, load_tuning_data, save_for_tuning
+from ._io import (
+    deconvolve_file,
+    deconvolve_from_export,
+    load_export_params,
+    load_tuning_data,
+    save_for_tuning,
+)
 from ._loaders import load_caiman, load_minian
 from ._simulate import (
     CellGroundTruth,
@@ -62,6 +68,7 @@ __all__ = [
     "solve_trace",
     "tau_to_ar2",
     # I/O
+    "deconvolve_file",
     "deconvolve_from_export",
     "load_export_params",
     "load_tuning_data",
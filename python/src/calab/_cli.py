@@ -101,7 +101,7 @@ def cmd_cadecon(args: argparse.Namespace) -> None:
 
 def cmd_deconvolve(args: argparse.Namespace) -> None:
     """Batch deconvolution from file."""
-    from ._compute import bandpass_filter, run_deconvolution, run_deconvolution_full
+    from ._compute import run_deconvolution, run_deconvolution_full
     from ._io import load_export_params
 
     traces = np.load(args.file)
@@ -110,18 +110,12 @@ def cmd_deconvolve(args: argparse.Namespace) -> None:
 
     params = load_export_params(args.params)
 
-    if params["filter_enabled"]:
-        traces = traces.copy()
-        for i in range(traces.shape[0]):
-            traces[i] = bandpass_filter(
-                traces[i], params["tau_rise"], params["tau_decay"], params["fs"],
-            )
-
     deconv_kwargs = dict(
         fs=params["fs"],
         tau_r=params["tau_rise"],
         tau_d=params["tau_decay"],
         lam=params["lambda_"],
+        filter_enabled=params["filter_enabled"],
     )
 
     if args.full:
@@ -6,9 +6,13 @@ build_kernel, etc.) but delegates to the native Rust solver via calab._solver.
 
 from __future__ import annotations
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import NamedTuple
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from ._solver import (
     PySolver,
@@ -123,26 +127,104 @@ def tau_to_ar2(
     return float(g1), float(g2), float(d), float(r)
 
 
+_filter_solvers = threading.local()
+
+# A cached solver is replaced once traces shrink below 1/_FILTER_SOLVER_SHRINK
+# of the length it was sized for, releasing the buffers a long trace grew.
+_FILTER_SOLVER_SHRINK = 4
+
+
+def _thread_filter_solver(n: int) -> PySolver:
+    """Return this thread's PySolver for filtering a trace of length ``n``.
+
+    Reusing one solver keeps its FFT plans, buffers and filter gain curve
+    across calls with the same trace length and time constants. It is
+    per-thread because the solver releases the GIL while filtering and
+    cannot be shared between concurrent calls.
+
+    The solver's buffers grow to the longest trace it has filtered and never
+    shrink, and each thread (including pooled ``n_jobs`` workers) keeps its
+    own. To bound that retention, the cached solver is dropped and rebuilt
+    when ``n`` is much shorter than the longest trace it has held.
+    """
+    solver = getattr(_filter_solvers, "solver", None)
+    sized_for = getattr(_filter_solvers, "sized_for", 0)
+    if solver is None or n * _FILTER_SOLVER_SHRINK < sized_for:
+        solver = PySolver()
+        solver.set_filter_enabled(True)
+        _filter_solvers.solver = solver
+        sized_for = 0
+    _filter_solvers.sized_for = max(sized_for, n)
+    return solver
+
+
 def bandpass_filter(
     trace: np.ndarray,
     tau_rise: float,
     tau_decay: float,
     fs: float,
 ) -> np.ndarray:
-    """Apply FFT bandpass filter derived from kernel time constants. Delegates to Rust."""
+    """Apply FFT bandpass filter derived from kernel time constants. Delegates to Rust.
+
+    The filter runs in float32. A float32 ``trace`` is filtered without a
+    conversion copy and returned as float32; any other input is returned as
+    float64.
+    """
     n = len(trace)
     if n < 8:
         return trace.copy()
 
-    solver = PySolver()
+    solver = _thread_filter_solver(n)
     solver.set_params(tau_rise, tau_decay, 0.01, fs)  # lambda irrelevant for filter
-    solver.set_filter_enabled(True)
     trace_f32 = np.ascontiguousarray(trace, dtype=np.float32)
     solver.set_trace(trace_f32)
     applied = solver.apply_filter()
     if not applied:
         return trace.copy()
-    return np.asarray(solver.get_trace(), dtype=np.float64)
+    out_dtype = np.float32 if trace.dtype == np.float32 else np.float64
+    return np.asarray(solver.get_trace(), dtype=out_dtype)
+
+
+def _resolve_float_dtype(dtype: DTypeLike) -> np.dtype:
+    """Validate an output ``dtype`` argument as a floating-point dtype."""
+    resolved = np.dtype(dtype)
+    if resolved.kind != "f":
+        raise ValueError(f"dtype must be a floating-point dtype, got {resolved}")
+    return resolved
+
+
+def _resolve_n_jobs(n_jobs: int) -> int:
+    """Translate an ``n_jobs`` argument into a positive worker count."""
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}")
+    return n_jobs
+
+
+def _solve_batch(traces_2d: np.ndarray, n_workers: int, *args, **kwargs) -> tuple:
+    """Run ``deconvolve_batch`` over row chunks on up to ``n_workers`` threads.
+
+    The Rust batch call releases the GIL while solving, so threads scale
+    without pickling traces across processes. Results are concatenated back
+    in input row order.
+    """
+    n_workers = min(n_workers, traces_2d.shape[0])
+    if n_workers <= 1:
+        return _deconvolve_batch(traces_2d, *args, **kwargs)
+
+    chunks = np.array_split(traces_2d, n_workers, axis=0)
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        parts = list(pool.map(lambda c: _deconvolve_batch(c, *args, **kwargs), chunks))
+
+    activities, baselines, reconvolutions, iterations, convergeds = zip(*parts, strict=True)
+    return (
+        np.concatenate([np.asarray(a) for a in activities], axis=0),
+        np.concatenate([np.asarray(b) for b in baselines]),
+        np.concatenate([np.asarray(r) for r in reconvolutions], axis=0),
+        np.concatenate([np.asarray(i) for i in iterations]),
+        np.concatenate([np.asarray(c) for c in convergeds]),
+    )
 
 
 def run_deconvolution(
@@ -154,10 +236,15 @@ def run_deconvolution(
     max_iters: int = 2000,
     conv_mode: str = "fft",
     constraint: str = "nonneg",
+    n_jobs: int = 1,
+    dtype: DTypeLike = np.float64,
+    filter_enabled: bool = False,
 ) -> np.ndarray:
     """Run FISTA deconvolution on one or more calcium traces.
 
-    Delegates to the Rust solver via calab._solver.
+    Delegates to the Rust solver via calab._solver. Multi-cell input is solved
+    by one solver per thread, so the kernel spectrum and FFT plans are built
+    once and shared by every cell; each cell still converges independently.
 
     Parameters
     ----------
@@ -179,28 +266,44 @@ def run_deconvolution(
     constraint : str, optional
         Constraint type: ``'nonneg'`` (default, L1 + non-negative) or
         ``'box01'`` (box constraint [0, 1], no L1 penalty).
+    n_jobs : int, optional
+        Number of threads used to solve multi-cell input, by default 1.
+        ``-1`` uses all available cores. Cells are split into contiguous
+        chunks, one solver per thread; results are identical to ``n_jobs=1``.
+    dtype : DTypeLike, optional
+        Floating-point dtype of the returned arrays, by default ``np.float64``.
+        The solver itself runs in float32, so ``np.float32`` returns its output
+        without the upcast copy and at half the memory.
+    filter_enabled : bool, optional
+        Apply the kernel-derived bandpass filter (see :func:`bandpass_filter`)
+        to each trace before solving, by default False. Filtering runs inside
+        the solver on its float32 working copy, with no extra array round-trip.
 
     Returns
     -------
     np.ndarray
         Non-negative activity estimates, same shape as input ``traces``.
     """
+    dtype = _resolve_float_dtype(dtype)
+    n_workers = _resolve_n_jobs(n_jobs)
     single_trace = traces.ndim == 1
-    traces_2d = np.atleast_2d(np.asarray(traces, dtype=np.float64))
+    traces_2d = np.atleast_2d(np.ascontiguousarray(traces, dtype=np.float64))
 
     if traces_2d.shape[0] == 1:
         activity, _, _, _, _ = _deconvolve_single(
             traces_2d[0], fs, tau_r, tau_d, lam, max_iters=max_iters,
             conv_mode=conv_mode, constraint=constraint,
+            hp_enabled=filter_enabled, lp_enabled=filter_enabled,
         )
-        result = np.asarray(activity, dtype=np.float64)
+        result = np.asarray(activity, dtype=dtype)
         return result if single_trace else result.reshape(1, -1)
 
-    activities, _, _, _, _ = _deconvolve_batch(
-        traces_2d, fs, tau_r, tau_d, lam, max_iters=max_iters,
+    activities, _, _, _, _ = _solve_batch(
+        traces_2d, n_workers, fs, tau_r, tau_d, lam, max_iters=max_iters,
         conv_mode=conv_mode, constraint=constraint,
+        hp_enabled=filter_enabled, lp_enabled=filter_enabled,
     )
-    return np.stack([np.asarray(a, dtype=np.float64) for a in activities])
+    return np.asarray(activities, dtype=dtype)
 
 
 def run_deconvolution_full(
@@ -212,6 +315,9 @@ def run_deconvolution_full(
     max_iters: int = 2000,
     conv_mode: str = "fft",
     constraint: str = "nonneg",
+    n_jobs: int = 1,
+    dtype: DTypeLike = np.float64,
+    filter_enabled: bool = False,
 ) -> DeconvolutionResult:
     """Run FISTA deconvolution returning full results.
 
@@ -235,6 +341,18 @@ def run_deconvolution_full(
     constraint : str, optional
         Constraint type: ``'nonneg'`` (default, L1 + non-negative) or
         ``'box01'`` (box constraint [0, 1], no L1 penalty).
+    n_jobs : int, optional
+        Number of threads used to solve multi-cell input, by default 1.
+        ``-1`` uses all available cores. Cells are split into contiguous
+        chunks, one solver per thread; results are identical to ``n_jobs=1``.
+    dtype : DTypeLike, optional
+        Floating-point dtype of the returned arrays, by default ``np.float64``.
+        The solver itself runs in float32, so ``np.float32`` returns its output
+        without the upcast copy and at half the memory.
+    filter_enabled : bool, optional
+        Apply the kernel-derived bandpass filter (see :func:`bandpass_filter`)
+        to each trace before solving, by default False. Filtering runs inside
+        the solver on its float32 working copy, with no extra array round-trip.
 
     Returns
     -------
@@ -242,33 +360,37 @@ def run_deconvolution_full(
         Namedtuple with fields: ``activity``, ``baseline``, ``reconvolution``,
         ``iterations``, ``converged``.
     """
+    dtype = _resolve_float_dtype(dtype)
+    n_workers = _resolve_n_jobs(n_jobs)
     single_trace = traces.ndim == 1
-    traces_2d = np.atleast_2d(np.asarray(traces, dtype=np.float64))
+    traces_2d = np.atleast_2d(np.ascontiguousarray(traces, dtype=np.float64))
 
     if single_trace:
         activity, baseline, reconvolution, iterations, converged = _deconvolve_single(
             traces_2d[0], fs, tau_r, tau_d, lam, max_iters=max_iters,
             conv_mode=conv_mode, constraint=constraint,
+            hp_enabled=filter_enabled, lp_enabled=filter_enabled,
         )
         return DeconvolutionResult(
-            activity=np.asarray(activity, dtype=np.float64),
+            activity=np.asarray(activity, dtype=dtype),
             baseline=baseline,
-            reconvolution=np.asarray(reconvolution, dtype=np.float64),
+            reconvolution=np.asarray(reconvolution, dtype=dtype),
             iterations=int(iterations),
             converged=bool(converged),
         )
 
-    activities, baselines, reconvolutions, iterations, convergeds = _deconvolve_batch(
-        traces_2d, fs, tau_r, tau_d, lam, max_iters=max_iters,
+    activities, baselines, reconvolutions, iterations, convergeds = _solve_batch(
+        traces_2d, n_workers, fs, tau_r, tau_d, lam, max_iters=max_iters,
         conv_mode=conv_mode, constraint=constraint,
+        hp_enabled=filter_enabled, lp_enabled=filter_enabled,
     )
 
     return DeconvolutionResult(
-        activity=np.stack([np.asarray(a, dtype=np.float64) for a in activities]),
-        baseline=np.array(baselines),
-        reconvolution=np.stack([np.asarray(r, dtype=np.float64) for r in reconvolutions]),
-        iterations=np.array(iterations, dtype=int),
-        converged=np.array(convergeds, dtype=bool),
+        activity=np.asarray(activities, dtype=dtype),
+        baseline=np.asarray(baselines, dtype=np.float64),
+        reconvolution=np.asarray(reconvolutions, dtype=dtype),
+        iterations=np.asarray(iterations, dtype=np.int64),
+        converged=np.asarray(convergeds, dtype=np.bool_),
     )
 
 
@@ -8,7 +8,9 @@ Also loads CaTune export JSONs for offline deconvolution.
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Literal
 
 import numpy as np
 
@@ -74,19 +76,23 @@ def save_for_tuning(
     """
     path = str(path)
 
-    # Coerce to Float64, C-contiguous
+    # Validate shape before coercion so bad input fails without a copy
+    ndim = np.ndim(traces)
+    if ndim > 2:
+        raise ValueError(
+            f"traces must be 1D or 2D, got {ndim}D array"
+        )
+
+    # Coerce to Float64, C-contiguous (no copy if it already is, e.g. solver output)
     traces = np.ascontiguousarray(traces, dtype=np.float64)
 
-    # Ensure 2D: (n_cells, n_timepoints)
+    # Ensure 2D: (n_cells, n_timepoints); a view for contiguous input
     if traces.ndim == 1:
         traces = traces.reshape(1, -1)
-    elif traces.ndim > 2:
-        raise ValueError(
-            f"traces must be 1D or 2D, got {traces.ndim}D array"
-        )
 
-    # Save .npy (Float64, C-contiguous, little-endian)
-    np.save(f"{path}.npy", traces)
+    # Save .npy (Float64, C-contiguous, little-endian). A plain numeric array
+    # never needs pickling; disabling it skips numpy's object-array fallback.
+    np.save(f"{path}.npy", traces, allow_pickle=False)
 
     # Build metadata sidecar
     meta = {
@@ -102,7 +108,10 @@ def save_for_tuning(
         json.dump(meta, f, indent=2)
 
 
-def load_tuning_data(path: str | Path) -> tuple[np.ndarray, dict]:
+def load_tuning_data(
+    path: str | Path,
+    mmap_mode: Literal["r", "r+", "c"] | None = None,
+) -> tuple[np.ndarray, dict]:
     """Load calcium traces and metadata saved by :func:`save_for_tuning`.
 
     Parameters
@@ -110,11 +119,17 @@ def load_tuning_data(path: str | Path) -> tuple[np.ndarray, dict]:
     path : str or Path
         Path stem (without extension), matching the ``path`` argument used
         in :func:`save_for_tuning`.
+    mmap_mode : {'r', 'r+', 'c'}, optional
+        If given, memory-map the ``.npy`` file instead of reading it into RAM
+        (see :func:`numpy.load`). Use ``'r'`` for large recordings: rows are
+        paged in from disk only as they are accessed, e.g. when slicing cells
+        or passing row chunks to :func:`~calab.run_deconvolution`.
 
     Returns
     -------
     traces : np.ndarray
-        Loaded traces array, dtype float64.
+        Loaded traces array, dtype float64 (a :class:`numpy.memmap` when
+        ``mmap_mode`` is set).
     metadata : dict
         Metadata from the JSON sidecar.
 
@@ -138,7 +153,7 @@ def load_tuning_data(path: str | Path) -> tuple[np.ndarray, dict]:
             f"Expected _metadata.json sidecar at this location."
         )
 
-    traces = np.load(npy_path)
+    traces = np.load(npy_path, mmap_mode=mmap_mode)
 
     with open(json_path) as f:
         metadata = json.load(f)
@@ -213,20 +228,12 @@ def deconvolve_from_export(
     np.ndarray or DeconvolutionResult
         Deconvolved activity (or full result if ``return_full=True``).
     """
-    from ._compute import bandpass_filter, run_deconvolution, run_deconvolution_full
+    from ._compute import run_deconvolution, run_deconvolution_full
 
     params = load_export_params(params_path)
 
-    # Optionally apply bandpass filter
-    if params["filter_enabled"]:
-        traces = np.atleast_2d(np.asarray(traces, dtype=np.float64)).copy()
-        for i in range(traces.shape[0]):
-            traces[i] = bandpass_filter(
-                traces[i], params["tau_rise"], params["tau_decay"], params["fs"],
-            )
-        if traces.shape[0] == 1:
-            traces = traces[0]
-
+    # The bandpass filter (if enabled) runs inside the solver on its float32
+    # working copy, so traces are converted exactly once.
     solver = run_deconvolution_full if return_full else run_deconvolution
     return solver(
         traces,
@@ -234,4 +241,85 @@ def deconvolve_from_export(
         tau_r=params["tau_rise"],
         tau_d=params["tau_decay"],
         lam=params["lambda_"],
+        filter_enabled=params["filter_enabled"],
+    )
+
+
+def deconvolve_file(
+    npy_path: str | Path,
+    params_path: str | Path,
+    output_path: str | Path,
+    n_jobs: int = 1,
+    chunk_cells: int = 256,
+) -> np.ndarray:
+    """Deconvolve a ``.npy`` trace file into an activity ``.npy``, streaming cells.
+
+    The input is memory-mapped and solved in blocks of ``chunk_cells`` rows.
+    While one block is being deconvolved, the next is read from disk on a
+    background thread (the solver releases the GIL), and each finished block
+    is written straight into ``output_path``. Peak memory is a few blocks
+    rather than the whole recording, which suits batch conversion of large
+    exports.
+
+    Parameters
+    ----------
+    npy_path : str or Path
+        Trace file, shape ``(n_timepoints,)`` or ``(n_cells, n_timepoints)``,
+        e.g. the ``.npy`` written by :func:`save_for_tuning`.
+    params_path : str or Path
+        Path to the CaTune export JSON file.
+    output_path : str or Path
+        Path of the activity ``.npy`` file to write (used as given; no
+        extension is appended).
+    n_jobs : int, optional
+        Threads per block, passed to :func:`~calab.run_deconvolution`.
+    chunk_cells : int, optional
+        Number of cells read, solved and written per block, by default 256.
+
+    Returns
+    -------
+    np.ndarray
+        Deconvolved activity, float64, same shape as the input traces, as a
+        read-only memmap of ``output_path``.
+    """
+    from ._compute import run_deconvolution
+
+    if chunk_cells < 1:
+        raise ValueError(f"chunk_cells must be >= 1, got {chunk_cells}")
+
+    params = load_export_params(params_path)
+    traces = np.load(npy_path, mmap_mode="r")
+    if traces.ndim not in (1, 2):
+        raise ValueError(f"traces must be 1D or 2D, got {traces.ndim}D array")
+    out_shape = traces.shape
+    # Blocks are solved as 2D; a 1D file is a single-cell block
+    traces = traces.reshape(-1, out_shape[-1])
+    n_cells = traces.shape[0]
+
+    def read_block(start: int) -> np.ndarray:
+        # Materializing the slice pages it in from disk off the solving thread
+        return np.array(traces[start:start + chunk_cells], dtype=np.float64)
+
+    out_file = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=np.float64, shape=out_shape,
     )
+    out = out_file.reshape(traces.shape)
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = reader.submit(read_block, 0)
+        for start in range(0, n_cells, chunk_cells):
+            block = pending.result()
+            if start + chunk_cells < n_cells:
+                pending = reader.submit(read_block, start + chunk_cells)
+            out[start:start + block.shape[0]] = run_deconvolution(
+                block,
+                fs=params["fs"],
+                tau_r=params["tau_rise"],
+                tau_d=params["tau_decay"],
+                lam=params["lambda_"],
+                n_jobs=n_jobs,
+                filter_enabled=params["filter_enabled"],
+            )
+    out_file.flush()
+    del out, out_file
+
+    return np.load(output_path, mmap_mode="r")
@@ -6,9 +6,26 @@ across test modules.
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
+
 import pytest
 import numpy as np
-from calab import build_kernel
+from calab import build_kernel, compute_lipschitz
+
+
+@functools.cache
+def _cached_kernel(tau_rise: float, tau_decay: float, fs: float) -> np.ndarray:
+    kernel = build_kernel(tau_rise, tau_decay, fs)
+    # Shared across the session, so guard against in-place mutation by a test.
+    kernel.setflags(write=False)
+    return kernel
+
+
+@functools.cache
+def _cached_kernel_stats(tau_rise: float, tau_decay: float, fs: float) -> tuple[float, float]:
+    kernel = _cached_kernel(tau_rise, tau_decay, fs)
+    return float(kernel.sum()), float(compute_lipschitz(kernel))
 
 
 @pytest.fixture
@@ -44,6 +61,58 @@ def slow_params() -> dict:
 
 
 @pytest.fixture
-def standard_kernel(standard_params: dict) -> np.ndarray:
-    """Pre-built kernel with standard parameters."""
-    return build_kernel(**standard_params)
+def standard_kernel(
+    standard_params: dict, kernel_factory: Callable[[float, float, float], np.ndarray]
+) -> np.ndarray:
+    """Pre-built (session-cached, read-only) kernel with standard parameters."""
+    return kernel_factory(**standard_params)
+
+
+@pytest.fixture
+def standard_lipschitz(
+    standard_params: dict,
+    kernel_stats_factory: Callable[[float, float, float], tuple[float, float]],
+) -> float:
+    """Session-cached Lipschitz constant of ``standard_kernel``."""
+    return kernel_stats_factory(**standard_params)[1]
+
+
+@pytest.fixture(scope="session")
+def kernel_factory() -> Callable[[float, float, float], np.ndarray]:
+    """Session-wide kernel builder memoised on (tau_rise, tau_decay, fs).
+
+    Returned kernels are read-only; call ``.copy()`` before mutating.
+    """
+    return _cached_kernel
+
+
+@pytest.fixture(scope="session")
+def kernel_default(kernel_factory: Callable[[float, float, float], np.ndarray]) -> np.ndarray:
+    """Read-only kernel for tau_rise=0.02s, tau_decay=0.4s, fs=30Hz."""
+    return kernel_factory(0.02, 0.4, 30.0)
+
+
+@pytest.fixture(scope="session")
+def kernel_stats_factory() -> Callable[[float, float, float], tuple[float, float]]:
+    """Session-wide ``(dc_gain, lipschitz)`` lookup for the cached kernels."""
+    return _cached_kernel_stats
+
+
+@pytest.fixture(scope="session")
+def kernel_fft(kernel_default: np.ndarray) -> Callable[[int], tuple[int, np.ndarray]]:
+    """Cached ``(nfft, rfft(kernel_default, nfft))`` for linear convolution at length n.
+
+    nfft is the next power of two >= n + klen - 1, so the circular product
+    equals linear convolution. The spectrum is float64-precision and read-only.
+    """
+    klen = len(kernel_default)
+    kernel64 = kernel_default.astype(np.float64)
+
+    @functools.cache
+    def spectrum(n: int) -> tuple[int, np.ndarray]:
+        nfft = 1 << (n + klen - 2).bit_length()
+        kernel_hat = np.fft.rfft(kernel64, nfft)
+        kernel_hat.setflags(write=False)
+        return nfft, kernel_hat
+
+    return spectrum
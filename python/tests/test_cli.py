@@ -65,12 +65,10 @@ def test_info_json(tmp_path: Path) -> None:
     assert "tau_rise_s" in result.stdout
 
 
-def test_deconvolve(tmp_path: Path) -> None:
+def test_deconvolve(tmp_path: Path, kernel_default: np.ndarray) -> None:
     """deconvolve subcommand produces output .npy."""
     # Create synthetic data
-    from calab import build_kernel
-
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = 200
     spikes = np.zeros(n)
     spikes[50] = 1.0
@@ -13,7 +13,6 @@ import pytest
 
 from calab import (
     build_kernel,
-    compute_lipschitz,
     load_tuning_data,
     run_deconvolution,
     run_deconvolution_full,
@@ -61,9 +60,9 @@ def test_kernel_equivalence_across_params(tau_r: float, tau_d: float, fs: float)
 # Test 2: Solver self-consistency
 # ---------------------------------------------------------------------------
 
-def test_solver_self_consistency():
+def test_solver_self_consistency(kernel_default: np.ndarray):
     """trace = convolve(activity, kernel) -> solver -> reconvolution ~ trace."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = 300
     event_locs = [20, 80, 150, 230]
 
@@ -77,7 +76,8 @@ def test_solver_self_consistency():
     result = run_deconvolution_full(trace, 30.0, 0.02, 0.4, 0.001)
 
     # Relative error < 5%
-    rel_err = np.linalg.norm(trace - result.reconvolution) / np.linalg.norm(trace)
+    diff = trace - result.reconvolution
+    rel_err = float(np.sqrt((diff @ diff) / (trace @ trace)))
     assert rel_err < 0.05, (
         f"Self-consistency relative error {rel_err:.6f} >= 0.05"
     )
@@ -87,19 +87,18 @@ def test_solver_self_consistency():
 # Test 3: Save-load-solve pipeline
 # ---------------------------------------------------------------------------
 
-def test_save_load_solve_pipeline(tmp_path):
+def test_save_load_solve_pipeline(tmp_path, kernel_fft):
     """Full pipeline: generate -> save -> load -> solve -> verify."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
     n = 500
     n_cells = 3
     event_locations = [[100], [200], [300]]
 
-    traces = np.zeros((n_cells, n))
+    activity = np.zeros((n_cells, n))
     for i, locs in enumerate(event_locations):
-        for loc in locs:
-            activity = np.zeros(n)
-            activity[loc] = 1.0
-            traces[i] += np.convolve(activity, kernel)[:n]
+        activity[i, locs] = 1.0
+    # Convolve all cells in one batched FFT along the time axis
+    nfft, kernel_hat = kernel_fft(n)
+    traces = np.fft.irfft(np.fft.rfft(activity, nfft, axis=1) * kernel_hat, nfft, axis=1)[:, :n]
 
     # Save
     path = str(tmp_path / "pipeline_test")
@@ -115,7 +114,7 @@ def test_save_load_solve_pipeline(tmp_path):
     # Solve
     solution = run_deconvolution(loaded, 30.0, 0.02, 0.4, 0.01)
     assert solution.shape == (n_cells, n)
-    assert np.all(solution >= 0)
+    assert solution.min() >= 0.0
 
     # Verify activity locations
     for i, locs in enumerate(event_locations):
@@ -130,7 +129,9 @@ def test_save_load_solve_pipeline(tmp_path):
 # Test 4: Objective decreases monotonically (with restart)
 # ---------------------------------------------------------------------------
 
-def test_objective_decreases_monotonically():
+def test_objective_decreases_monotonically(
+    kernel_default: np.ndarray, kernel_stats_factory, kernel_fft
+):
     """Objective should be non-increasing after adaptive restart settles.
 
     FISTA with adaptive restart may have brief increases when restart fires,
@@ -139,14 +140,13 @@ def test_objective_decreases_monotonically():
 
     This inline loop matches the updated solver with baseline + lambda*G_dc.
     """
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = 200
     klen = len(kernel)
-    lipschitz = compute_lipschitz(kernel)
+    kernel_dc_gain, lipschitz = kernel_stats_factory(0.02, 0.4, 30.0)
 
     # Effective lambda with kernel DC gain scaling
     lam = 0.01
-    kernel_dc_gain = float(kernel.sum())
     effective_lambda = lam * kernel_dc_gain
 
     # Create synthetic trace
@@ -158,32 +158,56 @@ def test_objective_decreases_monotonically():
     step_size = 1.0 / lipschitz
     threshold = step_size * effective_lambda
 
+    # FFT-domain forward/adjoint with a precomputed kernel spectrum. Zero-padding
+    # to >= n + klen - 1 makes the circular product equal linear convolution.
+    nfft, kernel_hat = kernel_fft(n)
+    kernel_hat_conj = np.conj(kernel_hat)
+
+    def forward(x: np.ndarray) -> np.ndarray:
+        return np.fft.irfft(np.fft.rfft(x, nfft) * kernel_hat, nfft)[:n]
+
+    def adjoint(r: np.ndarray) -> np.ndarray:
+        return np.fft.irfft(np.fft.rfft(r, nfft) * kernel_hat_conj, nfft)[:n]
+
+    probe = np.random.default_rng(0).standard_normal(n)
+    npt.assert_allclose(forward(probe), np.convolve(probe, kernel, "full")[:n], atol=1e-12)
+    npt.assert_allclose(
+        adjoint(probe),
+        np.convolve(probe, kernel[::-1], "full")[klen - 1 : klen - 1 + n],
+        atol=1e-12,
+    )
+
     solution = np.zeros(n)
     solution_prev = np.zeros(n)
+    # Loop-invariant scratch so the proximal/momentum updates run in place
+    x_prev = np.empty(n)
+    tmp = np.empty(n)
+    # mean(trace - recon) == (sum(trace) - sum(recon)) / n; trace is fixed,
+    # mirroring the solver's cached trace_sum.
+    trace_sum = float(trace.sum())
     t_fista = 1.0
     prev_objective = np.inf
     objectives = []
 
     for iteration in range(1, 501):
-        reconvolution = np.convolve(solution_prev, kernel, "full")[:n]
+        reconvolution = forward(solution_prev)
 
         # Baseline at y_k
-        baseline = float(np.mean(trace - reconvolution))
+        baseline = (trace_sum - float(reconvolution.sum())) / n
 
         # Residual includes baseline
         residual = reconvolution + baseline - trace
 
-        gradient = np.convolve(residual, kernel[::-1], "full")[
-            klen - 1 : klen - 1 + n
-        ]
-        x_prev = solution.copy()
-        solution = np.maximum(
-            solution_prev - step_size * gradient - threshold, 0.0
-        )
+        gradient = adjoint(residual)
+        np.copyto(x_prev, solution)
+        np.multiply(gradient, -step_size, out=tmp)
+        np.add(solution_prev, tmp, out=solution)
+        solution -= threshold
+        np.maximum(solution, 0.0, out=solution)
 
         # Recompute baseline at x_{k+1}
-        recon_new = np.convolve(solution, kernel, "full")[:n]
-        baseline = float(np.mean(trace - recon_new))
+        recon_new = forward(solution)
+        baseline = (trace_sum - float(recon_new.sum())) / n
 
         res = recon_new + baseline - trace
         objective = 0.5 * np.dot(res, res) + effective_lambda * solution.sum()
@@ -193,9 +217,10 @@ def test_objective_decreases_monotonically():
 
         t_new = (1.0 + np.sqrt(1.0 + 4.0 * t_fista * t_fista)) / 2.0
         momentum = (t_fista - 1.0) / t_new
-        solution_prev = np.maximum(
-            solution + momentum * (solution - x_prev), 0.0
-        )
+        np.subtract(solution, x_prev, out=tmp)
+        tmp *= momentum
+        tmp += solution
+        np.maximum(tmp, 0.0, out=solution_prev)
         t_fista = t_new
 
         if iteration > 5:
@@ -231,11 +256,9 @@ def test_adjoint_is_transpose_of_forward():
 
     # Build forward convolution matrix (causal, Toeplitz-like)
     # K[t, s] = kernel[t - s] if 0 <= t - s < klen, else 0
-    K = np.zeros((n, n))
-    for t in range(n):
-        for s in range(n):
-            if 0 <= t - s < klen:
-                K[t, s] = kernel[t - s]
+    lag = np.arange(n)[:, None] - np.arange(n)[None, :]
+    in_support = (lag >= 0) & (lag < klen)
+    K = np.where(in_support, kernel[np.clip(lag, 0, klen - 1)], 0.0)
 
     # Random test vectors
     rng = np.random.default_rng(42)
@@ -6,9 +6,11 @@ DC removal, short trace handling, and invalid cutoff handling.
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
-from calab import bandpass_filter
+from calab import bandpass_filter, run_deconvolution
 
 # ---------------------------------------------------------------------------
 # Test 1: Passband preservation
@@ -39,19 +41,23 @@ def test_passband_preservation():
 # ---------------------------------------------------------------------------
 
 def test_stopband_attenuation():
-    """0.005 Hz sine below HP cutoff: <10% power after filtering."""
-    n = 65536  # long trace for frequency resolution at low HP cutoff
+    """0.005 Hz below HP cutoff: <10% power gain in the filter's response.
+
+    Reads the gain from the FFT of a short impulse response rather than
+    filtering a long 0.005 Hz sine. m must be long enough that df = fs/m
+    puts at least one bin inside the HP stopband (below ~0.0125 Hz).
+    """
+    m = 8192
     fs = 100.0
     freq = 0.005  # well below HP cutoff ~0.025 Hz
 
-    t = np.arange(n) / fs
-    trace = np.sin(2 * np.pi * freq * t)
-    original_power = float(np.sum(trace ** 2))
-
-    filtered = bandpass_filter(trace, tau_rise=0.02, tau_decay=0.4, fs=fs)
+    impulse = np.zeros(m)
+    impulse[0] = 1.0
+    response = bandpass_filter(impulse, tau_rise=0.02, tau_decay=0.4, fs=fs)
 
-    filtered_power = float(np.sum(filtered ** 2))
-    ratio = filtered_power / original_power
+    gain = np.abs(np.fft.rfft(response))
+    freqs = np.fft.rfftfreq(m, 1.0 / fs)
+    ratio = float(np.interp(freq, freqs, gain)) ** 2
     assert ratio < 0.1, f"Stopband power ratio: {ratio:.4f}, expected < 0.1"
 
 
@@ -105,3 +111,89 @@ def test_output_length_matches_input():
 
     filtered = bandpass_filter(trace, tau_rise=0.02, tau_decay=0.4, fs=100.0)
     assert len(filtered) == n
+
+
+# ---------------------------------------------------------------------------
+# Test 7: Repeated calls reuse solver state without cross-talk
+# ---------------------------------------------------------------------------
+
+def _filter_in_fresh_thread(trace: np.ndarray, **params) -> np.ndarray:
+    """bandpass_filter on a new thread, so it starts from a fresh per-thread solver."""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(bandpass_filter, trace, **params).result()
+
+
+def test_repeated_calls_are_independent():
+    """Reusing this thread's solver across lengths and params matches a fresh solver."""
+    rng = np.random.default_rng(7)
+    long_trace = rng.standard_normal(600)
+    short_trace = rng.standard_normal(256)
+    fast = {"tau_rise": 0.02, "tau_decay": 0.4, "fs": 100.0}
+    slow = {"tau_rise": 0.05, "tau_decay": 1.0, "fs": 30.0}
+
+    first = bandpass_filter(long_trace, **fast)
+    short_slow = bandpass_filter(short_trace, **slow)
+    # Same length as the previous call, different params: a stale cached gain
+    # curve would show up here.
+    short_fast = bandpass_filter(short_trace, **fast)
+    again = bandpass_filter(long_trace, **fast)
+
+    np.testing.assert_array_equal(short_slow, _filter_in_fresh_thread(short_trace, **slow))
+    np.testing.assert_array_equal(short_fast, _filter_in_fresh_thread(short_trace, **fast))
+    np.testing.assert_array_equal(again, first)
+    assert not np.array_equal(short_fast, short_slow)
+
+
+# ---------------------------------------------------------------------------
+# Test 8: float32 input stays float32
+# ---------------------------------------------------------------------------
+
+def test_float32_dtype_preserved():
+    """float32 traces come back float32 with the same values as float64 input."""
+    rng = np.random.default_rng(3)
+    trace = rng.standard_normal(512).astype(np.float32)
+
+    filtered32 = bandpass_filter(trace, tau_rise=0.02, tau_decay=0.4, fs=100.0)
+    filtered64 = bandpass_filter(trace.astype(np.float64), tau_rise=0.02, tau_decay=0.4, fs=100.0)
+
+    assert filtered32.dtype == np.float32
+    assert filtered64.dtype == np.float64
+    np.testing.assert_array_equal(filtered32, filtered64.astype(np.float32))
+
+
+# ---------------------------------------------------------------------------
+# Test 9: In-solver filtering matches filter-then-deconvolve
+# ---------------------------------------------------------------------------
+
+def test_filter_enabled_matches_prefiltered_deconvolution():
+    """filter_enabled=True equals running bandpass_filter on each row first."""
+    rng = np.random.default_rng(5)
+    traces = rng.standard_normal((3, 400)) + np.linspace(0, 2, 400)
+
+    prefiltered = np.stack([bandpass_filter(row, 0.02, 0.4, 30.0) for row in traces])
+    expected = run_deconvolution(prefiltered, 30.0, 0.02, 0.4, 0.01)
+
+    result = run_deconvolution(traces, 30.0, 0.02, 0.4, 0.01, filter_enabled=True)
+    np.testing.assert_array_equal(result, expected)
+
+    single = run_deconvolution(traces[0], 30.0, 0.02, 0.4, 0.01, filter_enabled=True)
+    np.testing.assert_array_equal(single, expected[0])
+
+
+# ---------------------------------------------------------------------------
+# Test 10: Cached solver is dropped after a much longer trace
+# ---------------------------------------------------------------------------
+
+def test_cached_solver_released_after_long_trace():
+    """A much shorter trace replaces the solver a long trace grew; lengths nearby reuse it."""
+    from calab._compute import _thread_filter_solver
+
+    def solvers_for(lengths: tuple[int, ...]) -> list:
+        return [_thread_filter_solver(n) for n in lengths]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        solvers = pool.submit(solvers_for, (4000, 1500, 1000, 4000, 800)).result()
+
+    long_solver, near1, near2, again, short_solver = solvers
+    assert long_solver is near1 is near2 is again
+    assert short_solver is not long_solver
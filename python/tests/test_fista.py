@@ -11,9 +11,10 @@ from __future__ import annotations
 
 import numpy as np
 import numpy.testing as npt
+from numpy.lib.stride_tricks import sliding_window_view
 import pytest
 
-from calab import DeconvolutionResult, build_kernel, run_deconvolution, run_deconvolution_full
+from calab import DeconvolutionResult, run_deconvolution, run_deconvolution_full
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -22,7 +23,7 @@ from calab import DeconvolutionResult, build_kernel, run_deconvolution, run_deco
 def make_synthetic_trace(
     kernel: np.ndarray, n: int, event_locs: list[int], amplitudes: float | list[float] = 1.0
 ) -> np.ndarray:
-    """Generate a synthetic trace by convolving unit events with the kernel.
+    """Generate a synthetic trace by superimposing kernel copies at each event.
 
     Parameters
     ----------
@@ -42,20 +43,29 @@ def make_synthetic_trace(
     """
     if isinstance(amplitudes, (int, float)):
         amplitudes = [amplitudes] * len(event_locs)
-    activity = np.zeros(n)
-    for loc, amp in zip(event_locs, amplitudes, strict=True):
-        if 0 <= loc < n:
-            activity[loc] = amp
-    return np.convolve(activity, kernel)[:n]
+    locs = np.asarray(event_locs, dtype=np.intp)
+    amps = np.asarray(amplitudes, dtype=np.float64)
+    if amps.shape != locs.shape:
+        raise ValueError(f"{amps.size} amplitudes for {locs.size} events")
+    keep = (locs >= 0) & (locs < n)
+
+    # Events are sparse, so scatter-add scaled kernel copies directly instead
+    # of convolving a mostly-zero activity vector. np.add.at accumulates
+    # overlapping events.
+    taps = locs[keep, None] + np.arange(len(kernel))
+    in_range = taps < n
+    trace = np.zeros(n)
+    np.add.at(trace, taps[in_range], (amps[keep, None] * kernel)[in_range])
+    return trace
 
 
 # ---------------------------------------------------------------------------
 # Test 1: Delta impulse recovery (matches Rust test 1)
 # ---------------------------------------------------------------------------
 
-def test_delta_impulse_recovery():
+def test_delta_impulse_recovery(kernel_default: np.ndarray):
     """Trace = kernel (single event at t=0). Activity should be near t=0..2."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     trace = kernel.copy()
     n = len(trace)
 
@@ -91,34 +101,35 @@ def test_zero_trace_produces_zero_solution():
 # Test 3: Convergence within max_iters (matches Rust test 3)
 # ---------------------------------------------------------------------------
 
-def test_convergence_within_max_iters():
+def test_convergence_within_max_iters(kernel_default: np.ndarray):
     """Synthetic trace with 4 events should converge within 2000 iters."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     trace = make_synthetic_trace(kernel, 200, [10, 50, 100, 150])
 
     solution = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.01)
     assert solution.shape == (200,)
-    assert np.all(solution >= 0), "Solution should be non-negative"
+    assert solution.min() >= 0.0, "Solution should be non-negative"
     # Verify energy near event locations
-    for loc in [10, 50, 100, 150]:
-        window = solution[max(0, loc - 2) : loc + 3]
-        assert window.max() > 0.01, f"No energy near event at {loc}"
+    locs = np.array([10, 50, 100, 150])
+    starts = np.clip(locs - 2, 0, solution.size - 5)
+    window_max = sliding_window_view(solution, 5)[starts].max(axis=1)
+    assert np.all(window_max > 0.01), f"No energy near events at {locs[window_max <= 0.01]}"
 
 
 # ---------------------------------------------------------------------------
 # Test 4: Solution non-negative (matches Rust test 4)
 # ---------------------------------------------------------------------------
 
-def test_solution_non_negative():
+def test_solution_non_negative(kernel_default: np.ndarray):
     """Trace with events + sine noise: all solution values >= 0."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = 200
     trace = make_synthetic_trace(kernel, n, [20, 60, 120], amplitudes=2.0)
     # Add sine noise
     trace += 0.01 * np.sin(0.7 * np.arange(n))
 
     solution = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.01)
-    assert np.all(solution >= 0), (
+    assert solution.min() >= 0.0, (
         f"Negative values found: min={solution.min()}"
     )
 
@@ -127,24 +138,24 @@ def test_solution_non_negative():
 # Test 5: Deterministic output (matches Rust test 5)
 # ---------------------------------------------------------------------------
 
-def test_deterministic_output():
+def test_deterministic_output(kernel_default: np.ndarray):
     """Two runs with identical inputs produce identical output."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     trace = make_synthetic_trace(kernel, 150, [10, 50, 100])
 
     sol1 = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.01)
     sol2 = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.01)
 
-    npt.assert_allclose(sol1, sol2, atol=1e-15, err_msg="Solutions not identical")
+    npt.assert_array_equal(sol1, sol2, err_msg="Solutions not bitwise identical")
 
 
 # ---------------------------------------------------------------------------
 # Test 6: Reconvolution quality (matches Rust test 6)
 # ---------------------------------------------------------------------------
 
-def test_reconvolution_quality():
+def test_reconvolution_quality(kernel_default: np.ndarray):
     """Low lambda: reconvolution + baseline should approximate original trace."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = 200
     trace = make_synthetic_trace(kernel, n, [10, 50, 100, 150])
 
@@ -152,82 +163,79 @@ def test_reconvolution_quality():
 
     # Relative error < 15% (baseline subtraction shifts the floor slightly on
     # zero-baseline synthetic traces, adding a small systematic offset)
-    err = np.linalg.norm(trace - result.reconvolution) / np.linalg.norm(trace)
+    diff = trace - result.reconvolution
+    err = float(np.sqrt((diff @ diff) / (trace @ trace)))
     assert err < 0.15, f"Relative reconvolution error {err:.4f} >= 0.15"
 
 
 # ---------------------------------------------------------------------------
-# Test 7: Single trace 1D input
+# Test 7-8: 1D and 2D input shapes
 # ---------------------------------------------------------------------------
 
-def test_single_trace_1d_input():
-    """Pass 1D array, get 1D array back."""
-    trace = np.zeros(100)
-    trace[30] = 1.0
-    kernel = build_kernel(0.02, 0.4, 30.0)
-    trace = np.convolve(trace, kernel)[:100]
-
-    result = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.01)
-    assert result.ndim == 1, f"Expected 1D, got {result.ndim}D"
-    assert result.shape == (100,)
-
-
-# ---------------------------------------------------------------------------
-# Test 8: Multi-trace 2D input
-# ---------------------------------------------------------------------------
-
-def test_multi_trace_2d_input():
-    """Pass (3, 200) array, get (3, 200) back. Each row independent."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
-    n = 200
-    traces = np.zeros((3, n))
-    for i, loc in enumerate([30, 80, 140]):
-        activity = np.zeros(n)
-        activity[loc] = 1.0
-        traces[i] = np.convolve(activity, kernel)[:n]
+@pytest.mark.parametrize(
+    "row_locs,n,as_1d",
+    [
+        ([30], 100, True),
+        ([30, 80, 140], 200, False),
+    ],
+    ids=["1d", "2d"],
+)
+def test_input_shape_preserved(row_locs, n, as_1d, kernel_default: np.ndarray):
+    """1D in -> 1D out, (rows, n) in -> (rows, n) out. Each row independent."""
+    traces = np.stack([make_synthetic_trace(kernel_default, n, [loc]) for loc in row_locs])
+    if as_1d:
+        traces = traces[0]
 
     result = run_deconvolution(traces, 30.0, 0.02, 0.4, 0.01)
-    assert result.shape == (3, n), f"Expected (3, {n}), got {result.shape}"
-    assert np.all(result >= 0)
+    assert result.shape == traces.shape, f"Expected {traces.shape}, got {result.shape}"
+    assert result.dtype == np.float64
+    assert result.min() >= 0.0
 
     # Each row should have its event at the right place
-    for i, loc in enumerate([30, 80, 140]):
-        max_idx = int(np.argmax(result[i]))
-        assert abs(max_idx - loc) <= 2, (
-            f"Row {i}: max at {max_idx}, expected near {loc}"
-        )
+    max_idx = np.argmax(np.atleast_2d(result), axis=1)
+    assert np.all(np.abs(max_idx - np.asarray(row_locs)) <= 2), (
+        f"Row maxima at {max_idx.tolist()}, expected near {row_locs}"
+    )
 
 
 # ---------------------------------------------------------------------------
 # Test 9: Various parameter sets
 # ---------------------------------------------------------------------------
 
-@pytest.mark.parametrize(
-    "tau_r,tau_d,fs,lam",
-    [
+@pytest.fixture(
+    scope="module",
+    params=[
         (0.005, 0.1, 100.0, 0.01),   # fast kinetics
         (0.05, 1.0, 20.0, 0.01),     # slow kinetics
         (0.02, 0.4, 30.0, 0.1),      # medium lambda
     ],
+    ids=["fast", "slow", "medium-lambda"],
 )
-def test_various_parameter_sets(tau_r, tau_d, fs, lam):
+def kinetics(request, kernel_factory):
+    """Build the (trace, fs, tau_r, tau_d, lam) case once per kinetics set."""
+    tau_r, tau_d, fs, lam = request.param
+    kernel = kernel_factory(tau_r, tau_d, fs)
+    trace = make_synthetic_trace(kernel, 200, [50, 120])
+    trace.setflags(write=False)
+    return trace, fs, tau_r, tau_d, lam
+
+
+def test_various_parameter_sets(kinetics):
     """Run with different kinetics. Verify non-negative and converges."""
-    kernel = build_kernel(tau_r, tau_d, fs)
-    n = 200
-    trace = make_synthetic_trace(kernel, n, [50, 120])
+    trace, fs, tau_r, tau_d, lam = kinetics
 
     solution = run_deconvolution(trace, fs, tau_r, tau_d, lam)
-    assert solution.shape == (n,)
-    assert np.all(solution >= 0), f"Negative values found: min={solution.min()}"
+    assert solution.shape == trace.shape
+    assert solution.min() >= 0.0, f"Negative values found: min={solution.min()}"
 
 
 # ---------------------------------------------------------------------------
 # Test 10: High lambda suppresses activity
 # ---------------------------------------------------------------------------
 
-def test_high_lambda_suppresses_activity():
+def test_high_lambda_suppresses_activity(kernel_default: np.ndarray):
     """High lambda should produce sparser solution than low lambda."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     trace = make_synthetic_trace(kernel, 200, [50, 100], amplitudes=1.0)
 
     sol_low = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.001)
@@ -257,17 +265,17 @@ def test_short_trace():
     trace[3] = 0.5
     solution = run_deconvolution(trace, 30.0, 0.02, 0.4, 0.01)
     assert solution.shape == (10,)
-    assert np.all(solution >= 0)
+    assert solution.min() >= 0.0
 
 
 # ---------------------------------------------------------------------------
 # Test 12: Baseline recovery with DC offset
 # ---------------------------------------------------------------------------
 
-def test_baseline_recovery_with_dc_offset():
+def test_baseline_recovery_with_dc_offset(kernel_default: np.ndarray):
     """Trace with DC offset: baseline subtraction removes DC before solving,
     so the solver baseline should be ~0 (not the original DC offset)."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = 200
     dc_offset = 5.0
     trace = make_synthetic_trace(kernel, n, [10, 50, 100, 150])
@@ -286,42 +294,144 @@ def test_baseline_recovery_with_dc_offset():
 
 
 # ---------------------------------------------------------------------------
-# Test 13: run_deconvolution_full returns correct types
+# Test 13-14: run_deconvolution_full result fields for 1D and 2D input
 # ---------------------------------------------------------------------------
 
-def test_full_result_types():
-    """Verify DeconvolutionResult fields for single-trace input."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
-    trace = make_synthetic_trace(kernel, 100, [30])
+@pytest.mark.parametrize(
+    "row_locs,as_1d",
+    [
+        ([30], True),
+        ([30, 60], False),
+    ],
+    ids=["1d", "2d"],
+)
+def test_full_result_fields(row_locs, as_1d, kernel_default: np.ndarray):
+    """Scalars per field for 1D input, one entry per row for 2D input."""
+    n = 100
+    traces = np.stack([make_synthetic_trace(kernel_default, n, [loc]) for loc in row_locs])
+    if as_1d:
+        traces = traces[0]
 
-    result = run_deconvolution_full(trace, 30.0, 0.02, 0.4, 0.01)
+    result = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01)
 
     assert isinstance(result, DeconvolutionResult)
-    assert result.activity.ndim == 1
-    assert isinstance(result.baseline, float)
-    assert result.reconvolution.ndim == 1
-    assert isinstance(result.iterations, int)
-    assert isinstance(result.converged, bool)
+    assert result.activity.shape == traces.shape
+    assert result.reconvolution.shape == traces.shape
+    for field, scalar_type in (("baseline", float), ("iterations", int), ("converged", bool)):
+        value = getattr(result, field)
+        if as_1d:
+            assert isinstance(value, scalar_type), f"{field}: {type(value).__name__}"
+        else:
+            assert value.shape == (len(row_locs),), f"{field}: {value.shape}"
+    if not as_1d:
+        assert result.baseline.dtype == np.float64
+        assert result.iterations.dtype == np.int64
+        assert result.converged.dtype == np.bool_
 
 
 # ---------------------------------------------------------------------------
-# Test 14: run_deconvolution_full multi-trace
+# Test 15: n_jobs threading matches the serial result
 # ---------------------------------------------------------------------------
 
-def test_full_result_multi_trace():
-    """Verify DeconvolutionResult fields for multi-trace input."""
-    kernel = build_kernel(0.02, 0.4, 30.0)
-    n = 100
-    traces = np.zeros((2, n))
-    for i, loc in enumerate([30, 60]):
-        s = np.zeros(n)
-        s[loc] = 1.0
-        traces[i] = np.convolve(s, kernel)[:n]
+def test_n_jobs_matches_serial(kernel_default: np.ndarray):
+    """Solving across threads returns the same rows, in order, as n_jobs=1."""
+    n = 150
+    traces = np.stack([
+        make_synthetic_trace(kernel_default, n, [loc], 1.0 + 0.5 * i)
+        for i, loc in enumerate([20, 45, 70, 95, 120])
+    ])
+
+    serial = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01)
+    threaded = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01, n_jobs=3)
+
+    npt.assert_array_equal(threaded.activity, serial.activity)
+    npt.assert_array_equal(threaded.baseline, serial.baseline)
+    npt.assert_array_equal(threaded.reconvolution, serial.reconvolution)
+    npt.assert_array_equal(threaded.iterations, serial.iterations)
+    npt.assert_array_equal(
+        run_deconvolution(traces, 30.0, 0.02, 0.4, 0.01, n_jobs=-1), serial.activity
+    )
 
-    result = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01)
+    # Invalid n_jobs is rejected for every input shape, not only the batch path
+    for bad_input in (traces, traces[:1], traces[0]):
+        for bad_n_jobs in (0, -5):
+            with pytest.raises(ValueError, match="n_jobs"):
+                run_deconvolution(bad_input, 30.0, 0.02, 0.4, 0.01, n_jobs=bad_n_jobs)
+            with pytest.raises(ValueError, match="n_jobs"):
+                run_deconvolution_full(bad_input, 30.0, 0.02, 0.4, 0.01, n_jobs=bad_n_jobs)
+
+
+# ---------------------------------------------------------------------------
+# Test 16: dtype controls output precision without changing values
+# ---------------------------------------------------------------------------
+
+def test_output_dtype_float32(kernel_default: np.ndarray):
+    """dtype=np.float32 returns the solver's float32 output without upcasting."""
+    n = 120
+    traces = np.stack([make_synthetic_trace(kernel_default, n, [loc]) for loc in (25, 70)])
+
+    ref = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01)
+    full32 = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01, dtype=np.float32)
+    assert full32.activity.dtype == np.float32
+    assert full32.reconvolution.dtype == np.float32
+    npt.assert_array_equal(full32.activity.astype(np.float64), ref.activity)
+
+    single32 = run_deconvolution(traces[0], 30.0, 0.02, 0.4, 0.01, dtype=np.float32)
+    assert single32.dtype == np.float32
+    assert single32.shape == (n,)
+
+    with pytest.raises(ValueError, match="floating-point"):
+        run_deconvolution(traces, 30.0, 0.02, 0.4, 0.01, dtype=np.int32)
 
-    assert result.activity.shape == (2, n)
-    assert result.baseline.shape == (2,)
-    assert result.reconvolution.shape == (2, n)
-    assert result.iterations.shape == (2,)
-    assert result.converged.shape == (2,)
+
+# ---------------------------------------------------------------------------
+# Test 17: Batched solve matches per-row solves
+# ---------------------------------------------------------------------------
+
+def test_batch_matches_per_row(kernel_fft):
+    """Sharing one solver across cells gives the same result as solving each row alone."""
+    rng = np.random.default_rng(11)
+    n = 180
+    spikes = np.zeros((4, n))
+    offsets = np.zeros((4, n))
+    for i in range(4):
+        spikes[i] = rng.random(n) < 0.03
+        offsets[i] = 0.05 * rng.standard_normal(n) + i
+    # Convolve every row at once against the cached kernel spectrum
+    nfft, kernel_hat = kernel_fft(n)
+    traces = np.fft.irfft(np.fft.rfft(spikes, nfft, axis=1) * kernel_hat, nfft, axis=1)[:, :n]
+    traces += offsets
+
+    batch = run_deconvolution_full(traces, 30.0, 0.02, 0.4, 0.01)
+    for i in range(traces.shape[0]):
+        row = run_deconvolution_full(traces[i], 30.0, 0.02, 0.4, 0.01)
+        npt.assert_array_equal(batch.activity[i], row.activity)
+        npt.assert_array_equal(batch.reconvolution[i], row.reconvolution)
+        assert batch.baseline[i] == row.baseline
+        assert batch.iterations[i] == row.iterations
+
+
+# ---------------------------------------------------------------------------
+# Test 18: Non-contiguous and non-float64 input is accepted
+# ---------------------------------------------------------------------------
+
+def test_strided_input_matches_contiguous(kernel_default: np.ndarray):
+    """Strided views and float32 arrays solve the same as a contiguous float64 copy."""
+    n = 150
+    traces = np.stack([make_synthetic_trace(kernel_default, n, [loc]) for loc in (20, 70)])
+    expected = run_deconvolution(traces, 30.0, 0.02, 0.4, 0.01)
+
+    # Every other sample of a 2x-upsampled buffer, and the same values in Fortran order
+    strided = np.repeat(traces, 2, axis=1)[:, ::2]
+    fortran_order = np.asfortranarray(traces)
+    assert not strided.flags.c_contiguous and not fortran_order.flags.c_contiguous
+
+    npt.assert_array_equal(run_deconvolution(strided, 30.0, 0.02, 0.4, 0.01), expected)
+    npt.assert_array_equal(run_deconvolution(fortran_order, 30.0, 0.02, 0.4, 0.01), expected)
+    npt.assert_array_equal(run_deconvolution(strided[0], 30.0, 0.02, 0.4, 0.01), expected[0])
+    npt.assert_array_equal(
+        run_deconvolution_full(strided[1], 30.0, 0.02, 0.4, 0.01).activity, expected[1]
+    )
+    npt.assert_array_equal(
+        run_deconvolution(traces.astype(np.float32), 30.0, 0.02, 0.4, 0.01), expected
+    )
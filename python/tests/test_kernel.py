@@ -7,6 +7,7 @@ All tests verify numerical equivalence with the Rust solver implementation.
 from __future__ import annotations
 
 import numpy as np
+import pytest
 from numpy.testing import assert_allclose
 
 from calab import build_kernel, tau_to_ar2, compute_lipschitz
@@ -15,9 +16,9 @@ from calab import build_kernel, tau_to_ar2, compute_lipschitz
 # --- build_kernel tests ---
 
 
-def test_kernel_peak_is_one(standard_params: dict) -> None:
+def test_kernel_peak_is_one(standard_kernel: np.ndarray) -> None:
     """Rust test 1: Kernel peak is 1.0 for typical params."""
-    kernel = build_kernel(**standard_params)
+    kernel = standard_kernel
     assert_allclose(kernel.max(), 1.0, rtol=1e-10)
 
 
@@ -27,15 +28,15 @@ def test_kernel_peak_extreme_params() -> None:
     assert_allclose(kernel.max(), 1.0, rtol=1e-10)
 
 
-def test_kernel_first_sample_zero(standard_params: dict) -> None:
+def test_kernel_first_sample_zero(standard_kernel: np.ndarray) -> None:
     """Rust test 3: h(0) = exp(0) - exp(0) = 0."""
-    kernel = build_kernel(**standard_params)
+    kernel = standard_kernel
     assert abs(kernel[0]) < 1e-15
 
 
-def test_kernel_values_non_negative(standard_params: dict) -> None:
+def test_kernel_values_non_negative(standard_kernel: np.ndarray) -> None:
     """Rust test 4: All kernel values >= 0 (within float precision)."""
-    kernel = build_kernel(**standard_params)
+    kernel = standard_kernel
     assert np.all(kernel >= -1e-15), (
         f"Negative kernel values found: min={kernel.min()}"
     )
@@ -86,10 +87,12 @@ def test_ar2_roots_in_unit_interval(standard_params: dict) -> None:
 # --- compute_lipschitz tests ---
 
 
-def test_lipschitz_positive_and_bounded(standard_params: dict) -> None:
+def test_lipschitz_positive_and_bounded(
+    standard_kernel: np.ndarray, standard_lipschitz: float
+) -> None:
     """Rust test 8: L > 0, L >= sum_of_squares, L <= l1_norm^2."""
-    kernel = build_kernel(**standard_params)
-    lipschitz = compute_lipschitz(kernel)
+    kernel = standard_kernel
+    lipschitz = standard_lipschitz
 
     assert lipschitz > 0.0, "Lipschitz constant should be positive"
 
@@ -107,36 +110,29 @@ def test_lipschitz_positive_and_bounded(standard_params: dict) -> None:
     )
 
 
-def test_lipschitz_matches_reference() -> None:
-    """Lipschitz via compute_lipschitz matches explicit DFT loop (Rust algorithm).
+@pytest.mark.slow
+def test_lipschitz_matches_reference(kernel_default: np.ndarray, kernel_stats_factory) -> None:
+    """Lipschitz via compute_lipschitz matches an explicit DFT (Rust algorithm).
 
-    Computes the Lipschitz constant using an explicit loop matching the
+    Computes the Lipschitz constant from an explicit DFT matching the
     Rust implementation's direct DFT, then compares with compute_lipschitz
     which uses np.fft.fft. They should match within rtol=1e-10.
     """
-    kernel = build_kernel(0.02, 0.4, 30.0)
+    kernel = kernel_default
     n = len(kernel)
 
-    # Explicit DFT loop matching Rust code (lines 67-82 of kernel.rs)
+    # Same zero-padded length as compute_lipschitz in kernel.rs: next power of two >= 2n
     fft_len = 1
     target = 2 * n
     while fft_len < target:
         fft_len *= 2
 
-    max_power_ref = 0.0
-    for w in range(fft_len):
-        freq = 2.0 * np.pi * w / fft_len
-        re = 0.0
-        im = 0.0
-        for k in range(n):
-            angle = freq * k
-            re += kernel[k] * np.cos(angle)
-            im -= kernel[k] * np.sin(angle)
-        power = re * re + im * im
-        if power > max_power_ref:
-            max_power_ref = power
-
-    lipschitz = compute_lipschitz(kernel)
+    # Same DFT as one (fft_len, n) phase matrix times the kernel
+    phase = np.exp(-1j * (2.0 * np.pi / fft_len) * np.outer(np.arange(fft_len), np.arange(n)))
+    spectrum = phase @ kernel.astype(np.float64)
+    max_power_ref = float(np.max(spectrum.real**2 + spectrum.imag**2))
+
+    _, lipschitz = kernel_stats_factory(0.02, 0.4, 30.0)
     assert_allclose(lipschitz, max_power_ref, rtol=1e-10)
 
 